@@ -2,9 +2,21 @@
 # -*- coding: utf-8 -*-
 
 from qingyuan_core import QingYuan
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
+from werkzeug.exceptions import HTTPException
+import copy
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+# 尝试导入orjson，用于加速搜索结果的JSON序列化
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # 默认配置
 DEFAULT_CONFIG = {
     "search_engines": {
@@ -140,7 +152,10 @@ DEFAULT_CONFIG = {
             "domains": [],
             "enabled": True,
             "domain_status": {},
-            "search_urls": {}
+            "search_urls": {},
+            # 可选的专用CSS选择器，直接定位网站的图片元素，如 {"example.com": "div.gallery img"}；
+            # 选择器无效时忽略，没有匹配结果时按通用规则扫描整页
+            "selectors": {}
         }
     },
     "blacklist": {
@@ -152,7 +167,14 @@ DEFAULT_CONFIG = {
     },
     "settings": {
         "engine_max_results": 35,
-        "site_timeout": 10
+        "site_timeout": 10,
+        "max_per_host": 4,
+        "fast_parse": False,
+        "selenium_pool_size": 2,
+        "max_html_bytes": 2000000,
+        "verify_ssl": True,
+        "insecure_domains": [],
+        "debug": False
     }
 }
 
@@ -160,8 +182,23 @@ DEFAULT_CONFIG = {
 qingyuan = QingYuan()
 
 def main():
+    # 调试日志：settings.debug为true时输出搜索过程的详细信息，默认只输出警告
+    logging.basicConfig(level=logging.WARNING, format='[%(levelname)s] %(message)s')
+    debug = qingyuan.web_search.config.get('settings', {}).get('debug', False)
+    logging.getLogger('web_search').setLevel(logging.DEBUG if debug else logging.WARNING)
+    logger.setLevel(logging.DEBUG if debug else logging.WARNING)
+    
     app = Flask(__name__, static_folder='public', static_url_path='')
 
+    @app.errorhandler(Exception)
+    def handle_exception(e):
+        """统一处理接口异常，返回JSON格式的错误信息"""
+        # 404、405等HTTP错误保持Flask默认处理
+        if isinstance(e, HTTPException):
+            return e
+        logger.exception("处理请求 %s 失败", request.path)
+        return jsonify({'error': str(e)}), 500
+
     @app.post('/api/search')
     def api_search():
         data = request.get_json(force=True) or {}
@@ -173,6 +210,11 @@ def main():
         # 使用新的分离式搜索系统，所有搜索类型使用相同的结果数量
         limit = 60 
         res = qingyuan.web_search.search(q, search_type=stype, page=page, limit=limit, category=category)
+        if ORJSON_AVAILABLE:
+            try:
+                return Response(orjson.dumps({"results": res}), mimetype='application/json')
+            except TypeError:
+                pass  # 结果中含有orjson不支持的类型时回退到jsonify
         return jsonify({"results": res})
 
     @app.get('/')
@@ -187,31 +229,26 @@ def main():
     @app.get('/api/config')
     def get_config():
         """获取配置"""
-        try:
-            # 强制重新加载配置
-            qingyuan.web_search.config = qingyuan.web_search._load_config()
-            config = qingyuan.web_search.get_all_sites()
-            return jsonify(config)
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        # 强制重新加载配置，并同步到所有搜索类（之后的修改作用在同一份配置上）
+        qingyuan.web_search.config = qingyuan.web_search._load_config()
+        qingyuan.web_search._rebuild_plans()
+        config = qingyuan.web_search.get_all_sites()
+        return jsonify(config)
 
     @app.post('/api/config/add-site')
     def add_site():
         """添加网站"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain')
-            site_type = data.get('siteType')
-            search_urls = data.get('searchUrls', [])
-            category = data.get('category', 'custom')  # 添加分类参数
-            
-            if not domain or not site_type:
-                return jsonify({'error': '缺少必要参数'}), 400
-            
-            result = qingyuan.web_search.add_site(domain, site_type, search_urls, category)
-            return jsonify(result)
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain')
+        site_type = data.get('siteType')
+        search_urls = data.get('searchUrls', [])
+        category = data.get('category', 'custom')  # 添加分类参数
+        
+        if not domain or not site_type:
+            return jsonify({'error': '缺少必要参数'}), 400
+        
+        result = qingyuan.web_search.add_site(domain, site_type, search_urls, category)
+        return jsonify(result)
 
     @app.post('/api/config/import')
     def import_config():
@@ -225,7 +262,7 @@ def main():
                 if key not in data:
                     return jsonify({'success': False, 'message': f'配置文件缺少必要字段: {key}'}), 400
             
-            # 更新配置
+            # 更新配置（保存时会同步到所有搜索类并重建搜索计划）
             qingyuan.web_search.config = data
             qingyuan.web_search._save_config()
             
@@ -239,11 +276,8 @@ def main():
         try:
             # 强制重新加载配置
             qingyuan.web_search.config = qingyuan.web_search._load_config()
-            # 同步到所有搜索类
-            qingyuan.web_search.web_search.config = qingyuan.web_search.config
-            qingyuan.web_search.image_search.config = qingyuan.web_search.config
-            qingyuan.web_search.video_search.config = qingyuan.web_search.config
-            qingyuan.web_search.resource_search.config = qingyuan.web_search.config
+            # 同步到所有搜索类并重建搜索计划
+            qingyuan.web_search._rebuild_plans()
             return jsonify({'success': True, 'message': '配置重新加载成功'})
         except Exception as e:
             return jsonify({'success': False, 'message': f'重新加载失败: {str(e)}'}), 500
@@ -251,267 +285,216 @@ def main():
     @app.post('/api/config/remove-site')
     def remove_site():
         """删除网站"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain')
-            site_type = data.get('siteType')
-            
-            if not domain or not site_type:
-                return jsonify({'error': '缺少必要参数'}), 400
-            
-            # 新的统一搜索接口直接使用短名称
-            qingyuan.web_search.remove_site(domain, site_type)
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain')
+        site_type = data.get('siteType')
+        
+        if not domain or not site_type:
+            return jsonify({'error': '缺少必要参数'}), 400
+        
+        # 新的统一搜索接口直接使用短名称
+        qingyuan.web_search.remove_site(domain, site_type)
+        return jsonify({'success': True})
 
     @app.post('/api/config/toggle-site')
     def toggle_site():
         """切换网站状态"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain')
-            site_type = data.get('siteType')
-            enabled = data.get('enabled')
-            
-            if not domain or not site_type or enabled is None:
-                return jsonify({'error': '缺少必要参数'}), 400
-            
-            # 新的统一搜索接口直接使用短名称
-            qingyuan.web_search.toggle_site_enabled(domain, site_type, enabled)
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain')
+        site_type = data.get('siteType')
+        enabled = data.get('enabled')
+        
+        if not domain or not site_type or enabled is None:
+            return jsonify({'error': '缺少必要参数'}), 400
+        
+        # 新的统一搜索接口直接使用短名称
+        qingyuan.web_search.toggle_site_enabled(domain, site_type, enabled)
+        return jsonify({'success': True})
 
     @app.post('/api/config/blacklist')
     def manage_blacklist():
         """管理黑名单"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain')
-            action = data.get('action')
-            
-            if not domain or not action:
-                return jsonify({'error': '缺少必要参数'}), 400
-            
-            if action == 'add':
-                qingyuan.web_search.add_to_blacklist(domain)
-            elif action == 'remove':
-                qingyuan.web_search.remove_from_blacklist(domain)
-            else:
-                return jsonify({'error': '无效的操作'}), 400
-            
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain')
+        action = data.get('action')
+        
+        if not domain or not action:
+            return jsonify({'error': '缺少必要参数'}), 400
+        
+        if action == 'add':
+            qingyuan.web_search.add_to_blacklist(domain)
+        elif action == 'remove':
+            qingyuan.web_search.remove_from_blacklist(domain)
+        else:
+            return jsonify({'error': '无效的操作'}), 400
+        
+        return jsonify({'success': True})
 
     @app.post('/api/config/settings')
     def save_settings():
         """保存设置"""
-        try:
-            data = request.get_json(force=True) or {}
-            engine_max_results = data.get('engineMaxResults')
-            site_timeout = data.get('siteTimeout')
-            
-            # 更新配置
-            if 'settings' not in qingyuan.web_search.config:
-                qingyuan.web_search.config['settings'] = {}
-            
-            if engine_max_results is not None:
-                qingyuan.web_search.config['settings']['engine_max_results'] = engine_max_results
-            
-            if site_timeout is not None:
-                qingyuan.web_search.config['settings']['site_timeout'] = site_timeout
-            
-            qingyuan.web_search._save_config()
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        engine_max_results = data.get('engineMaxResults')
+        site_timeout = data.get('siteTimeout')
+        
+        # 更新配置
+        if 'settings' not in qingyuan.web_search.config:
+            qingyuan.web_search.config['settings'] = {}
+        
+        if engine_max_results is not None:
+            qingyuan.web_search.config['settings']['engine_max_results'] = engine_max_results
+        
+        if site_timeout is not None:
+            qingyuan.web_search.config['settings']['site_timeout'] = site_timeout
+        
+        # 保存时同步设置快照到各搜索类
+        qingyuan.web_search._save_config()
+        return jsonify({'success': True})
 
 
 
     @app.get('/api/config/search-urls/<site_type>')
     def get_search_urls(site_type: str):
         """获取指定类型的搜索URL配置"""
-        try:
-            config = qingyuan.web_search.get_all_sites()
-            if site_type in config and 'custom' in config[site_type]:
-                search_urls = config[site_type]['custom'].get('search_urls', {})
-                return jsonify(search_urls)
-            return jsonify({})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        config = qingyuan.web_search.get_all_sites()
+        if site_type in config and 'custom' in config[site_type]:
+            search_urls = config[site_type]['custom'].get('search_urls', {})
+            return jsonify(search_urls)
+        return jsonify({})
 
     @app.post('/api/config/search-urls/<site_type>')
     def update_search_urls(site_type: str):
         """更新指定类型的搜索URL配置"""
-        try:
-            data = request.get_json(force=True) or {}
-            search_urls = data.get('searchUrls', {})
-            
-            # 新的统一搜索接口需要分别更新每个域名的搜索URL
-            for domain, urls in search_urls.items():
-                qingyuan.web_search.update_site_search_urls(site_type, domain, urls)
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        search_urls = data.get('searchUrls', {})
+        
+        # 新的统一搜索接口需要分别更新每个域名的搜索URL
+        for domain, urls in search_urls.items():
+            qingyuan.web_search.update_site_search_urls(site_type, domain, urls)
+        return jsonify({'success': True})
 
     @app.get('/api/config/sites/<site_type>/urls/<domain>')
     def get_site_urls(site_type: str, domain: str):
         """获取指定网站的搜索URL"""
-        try:
-            urls = qingyuan.web_search.get_site_search_urls(site_type, domain)
-            return jsonify({'searchUrls': urls})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        urls = qingyuan.web_search.get_site_search_urls(site_type, domain)
+        return jsonify({'searchUrls': urls})
 
     @app.post('/api/config/sites/<site_type>/edit')
     def edit_site(site_type: str):
         """编辑网站配置"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain', '').strip()
-            search_urls = data.get('searchUrls', [])
-            
-            if not domain:
-                return jsonify({'error': '域名不能为空'}), 400
-            
-            qingyuan.web_search.update_site_search_urls(site_type, domain, search_urls)
-            return jsonify({'success': True})
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain', '').strip()
+        search_urls = data.get('searchUrls', [])
+        
+        if not domain:
+            return jsonify({'error': '域名不能为空'}), 400
+        
+        qingyuan.web_search.update_site_search_urls(site_type, domain, search_urls)
+        return jsonify({'success': True})
 
     @app.post('/api/config/reset')
     def reset_config():
         """重置配置到硬编码的默认配置"""
-        try:
-            # 使用默认配置变量
-            new_config = DEFAULT_CONFIG.copy()
-            
-            # 更新主配置
-            qingyuan.web_search.config = new_config
-            
-            # 更新各个搜索类的配置
-            qingyuan.web_search.web_search.config = new_config
-            qingyuan.web_search.image_search.config = new_config
-            qingyuan.web_search.video_search.config = new_config
-            qingyuan.web_search.resource_search.config = new_config
-            
-            # 保存重置后的配置到文件
-            qingyuan.web_search._save_config()
-            
-            print(f"[DEBUG] 配置已重置，新配置包含 {len(new_config.get('web_sites', {}).get('custom', {}).get('domains', []))} 个网页网站")
-            print(f"[DEBUG] 新配置包含 {len(new_config.get('resource_sites', {}).get('custom', {}).get('domains', []))} 个资源网站")
-            
-            return jsonify({'success': True, 'message': '配置已重置到默认配置'})
-        except Exception as e:
-            print(f"[DEBUG] 重置配置失败: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'error': str(e)}), 500
+        # 使用默认配置变量（深拷贝，避免后续修改污染DEFAULT_CONFIG）
+        new_config = copy.deepcopy(DEFAULT_CONFIG)
+        
+        # 更新主配置，保存到文件时同步到各个搜索类
+        qingyuan.web_search.config = new_config
+        qingyuan.web_search._save_config()
+        
+        logger.debug("配置已重置，新配置包含 %s 个网页网站", len(new_config.get('web_sites', {}).get('custom', {}).get('domains', [])))
+        logger.debug("新配置包含 %s 个资源网站", len(new_config.get('resource_sites', {}).get('custom', {}).get('domains', [])))
+        
+        return jsonify({'success': True, 'message': '配置已重置到默认配置'})
 
     @app.post('/api/config/categories')
     def manage_categories():
         """管理资源分类"""
-        try:
-            data = request.get_json(force=True) or {}
-            action = data.get('action')
-            name = data.get('name', '').strip()
-            description = data.get('description', '').strip()
-            sites = data.get('sites', [])  # 获取选中的网站列表
+        data = request.get_json(force=True) or {}
+        action = data.get('action')
+        name = data.get('name', '').strip()
+        description = data.get('description', '').strip()
+        sites = data.get('sites', [])  # 获取选中的网站列表
+        
+        if not name:
+            return jsonify({'error': '分类名称不能为空'}), 400
+        
+        if action == 'add':
+            try:
+                # 添加分类和加入网站合并为一次配置写入
+                with qingyuan.web_search.batch():
+                    # 添加分类
+                    result = qingyuan.web_search.add_category(name, description)
+                    
+                    # 如果分类添加成功且有选中的网站，将网站添加到新分类
+                    if result.get('success') and sites:
+                        for site in sites:
+                            domain = site.get('domain')
+                            if domain:
+                                # 将网站添加到新分类（支持多分类）
+                                qingyuan.web_search.add_site_to_category(domain, 'resources', name)
+            except Exception as e:
+                return jsonify({'success': False, 'message': f'保存失败: {str(e)}'}), 500
             
-            if not name:
-                return jsonify({'error': '分类名称不能为空'}), 400
+            return jsonify(result)
+        elif action == 'delete':
+            # 删除分类
+            result = qingyuan.web_search.delete_category(name)
+            return jsonify(result)
+        else:
+            return jsonify({'error': '无效的操作'}), 400
             
-            if action == 'add':
-                # 添加分类
-                result = qingyuan.web_search.add_category(name, description)
-                
-                # 如果分类添加成功且有选中的网站，将网站添加到新分类
-                if result.get('success') and sites:
-                    for site in sites:
-                        domain = site.get('domain')
-                        if domain:
-                            # 将网站添加到新分类（支持多分类）
-                            qingyuan.web_search.add_site_to_category(domain, 'resources', name)
-                
-                return jsonify(result)
-            elif action == 'delete':
-                # 删除分类
-                result = qingyuan.web_search.delete_category(name)
-                return jsonify(result)
-            else:
-                return jsonify({'error': '无效的操作'}), 400
-                
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
 
     @app.post('/api/config/remove-site-from-category')
     def remove_site_from_category():
         """从分类中移除网站"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain', '').strip()
-            site_type = data.get('siteType', '')
-            category = data.get('category', '').strip()
-            
-            if not domain or not site_type or not category:
-                return jsonify({'error': '缺少必要参数'}), 400
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain', '').strip()
+        site_type = data.get('siteType', '')
+        category = data.get('category', '').strip()
+        
+        if not domain or not site_type or not category:
+            return jsonify({'error': '缺少必要参数'}), 400
+        
+        result = qingyuan.web_search.remove_site_from_category(domain, site_type, category)
+        return jsonify(result)
             
-            result = qingyuan.web_search.remove_site_from_category(domain, site_type, category)
-            return jsonify(result)
-                
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
 
     @app.post('/api/config/add-site-to-category')
     def add_site_to_category():
         """添加网站到分类"""
-        try:
-            data = request.get_json(force=True) or {}
-            domain = data.get('domain', '').strip()
-            site_type = data.get('siteType', '')
-            category = data.get('category', '').strip()
-            
-            if not domain or not site_type or not category:
-                return jsonify({'error': '缺少必要参数'}), 400
+        data = request.get_json(force=True) or {}
+        domain = data.get('domain', '').strip()
+        site_type = data.get('siteType', '')
+        category = data.get('category', '').strip()
+        
+        if not domain or not site_type or not category:
+            return jsonify({'error': '缺少必要参数'}), 400
+        
+        result = qingyuan.web_search.add_site_to_category(domain, site_type, category)
+        return jsonify(result)
             
-            result = qingyuan.web_search.add_site_to_category(domain, site_type, category)
-            return jsonify(result)
-                
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
 
-    # 自动打开浏览器
+    # 服务器启动后自动打开浏览器（定时器线程，不阻塞启动流程）
     import webbrowser
     import threading
-    import time
-    import atexit
     import signal
     import sys
     
-    def open_browser():
-        time.sleep(1.5)  # 等待服务器启动
-        webbrowser.open('http://127.0.0.1:8787')
-    
-    def cleanup_on_exit():
-        """程序退出时的清理函数"""
-        print("\n程序正在退出...")
+    def handle_sigterm(signum, frame):
+        """SIGTERM默认直接结束进程而不执行atexit清理（写入延迟保存的配置、关闭浏览器池），转为正常退出"""
+        # 先写入延迟保存的配置修改，不依赖atexit的执行
+        try:
+            qingyuan.web_search.flush_config()
+        except Exception:
+            logger.exception("退出前保存配置失败")
         sys.exit(0)
     
-    def signal_handler(signum, frame):
-        """信号处理器"""
-        cleanup_on_exit()
+    signal.signal(signal.SIGTERM, handle_sigterm)
     
-    # 注册退出处理函数
-    atexit.register(cleanup_on_exit)
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
-    # 在新线程中打开浏览器
-    browser_thread = threading.Thread(target=open_browser)
-    browser_thread.daemon = True
-    browser_thread.start()
+    browser_timer = threading.Timer(1.5, webbrowser.open, args=('http://127.0.0.1:8787',))
+    browser_timer.daemon = True
+    browser_timer.start()
     
     print("=" * 50)
     print("WATER清源已启动！")
@@ -542,13 +525,23 @@ def main():
     print("注意：127.0.0.1 只能本机访问，局域网IP可以同网络设备访问")
     
     try:
-        app.run(host='127.0.0.1', port=8787, debug=False)
+        try:
+            from waitress import serve
+        except ImportError:
+            serve = None
+        
+        if serve is not None:
+            # 使用waitress的固定线程池处理并发搜索请求
+            serve(app, host='127.0.0.1', port=8787, threads=16)
+        else:
+            app.run(host='127.0.0.1', port=8787, debug=False, threaded=True)
     except KeyboardInterrupt:
         print("\n收到退出信号，程序正在关闭...")
-        cleanup_on_exit()
     except Exception as e:
         print(f"\n程序异常退出: {e}")
-        cleanup_on_exit()
+    finally:
+        browser_timer.cancel()
+        print("程序正在退出...")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
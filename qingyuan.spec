@@ -15,10 +15,21 @@ a = Analysis(
     ],
     hiddenimports=[
         'flask',
+        'waitress',
+        'orjson',
         'requests',
+        'requests.adapters',
         'beautifulsoup4',
+        'soupsieve',
         'urllib3',
+        'urllib3.util.retry',
+        'brotli',
         'lxml',
+        'lxml.etree',
+        'lxml.html',
+        'selectolax',
+        'selectolax.lexbor',
+        'ahocorasick',
         'selenium',
         'selenium.webdriver',
         'selenium.webdriver.chrome',
@@ -27,15 +38,25 @@ a = Analysis(
         'selenium.webdriver.support.ui',
         'selenium.webdriver.support.expected_conditions',
         'selenium.common.exceptions',
+        'atexit',
+        'copy',
+        'hashlib',
+        'html',
+        'itertools',
         'json',
+        'logging',
+        'operator',
         'os',
+        'queue',
         'random',
         're',
         'time',
-        'traceback',
         'urllib.parse',
         'base64',
         'concurrent.futures',
+        'contextlib',
+        'collections',
+        'functools',
         'threading',
     ],
     hookspath=[],
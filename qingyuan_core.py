@@ -20,8 +20,8 @@ class QingYuan:
     def __init__(self):
         self.name = "清源"
         self.web_search = UnifiedSearch()  # 使用新的统一搜索接口
-        self.config = self._load_config()
         self._config_mtime = None
+        self.config = self._load_config()  # 加载时记录mtime，首次请求无需重复读取
 
     def _cleanup_whitespace(self, text: str) -> str:
         import re
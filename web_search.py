@@ -1,19 +1,36 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import atexit
+import base64
+import copy
+import hashlib
+import html
+import itertools
 import json
+import logging
 import os
+import queue
 import random
 import re
+import threading
 import time
-import traceback
-from typing import List, Dict, Any, Optional
-from urllib.parse import urlparse, parse_qs, unquote, quote
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict, namedtuple
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, urljoin, parse_qs, unquote, quote, quote_plus
+from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 
 import requests
 import urllib3
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
+import soupsieve
+
+logger = logging.getLogger(__name__)
 
 
 # 尝试导入Selenium相关模块
@@ -27,11 +44,303 @@ try:
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
-    print("[DEBUG] Selenium未安装，将使用requests进行搜索")
+    logger.debug("Selenium未安装，将使用requests进行搜索")
+
+# 尝试导入selectolax，用于快速解析Bing搜索结果页
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# 安装brotli后urllib3可以解压br编码的响应
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 尝试导入pyahocorasick，用于资源搜索中无关标题关键词的多模式匹配
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# 尝试导入orjson，用于加速配置文件的序列化
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTML解析器：优先使用C实现的lxml，未安装时回退到内置的html.parser
+try:
+    import lxml.etree
+    import lxml.html
+    LXML_AVAILABLE = True
+    _PARSER = 'lxml'
+except ImportError:
+    LXML_AVAILABLE = False
+    _PARSER = 'html.parser'
 
-# 禁用SSL警告
+# 禁用SSL警告（只有settings.insecure_domains中的网站或关闭verify_ssl时才会不校验证书）
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 上游请求并发限制（所有搜索实例共享）
+MAX_CONCURRENT_REQUESTS = 100
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_host_slots: Dict[Tuple[str, int], threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def _host_slot(host: str, limit: int) -> threading.BoundedSemaphore:
+    """获取单个主机的并发信号量，避免同时向同一网站发起过多请求
+    
+    按(主机, 上限)缓存：settings.max_per_host修改后新请求使用新上限的信号量
+    """
+    key = (host, limit)
+    with _host_slots_lock:
+        slot = _host_slots.get(key)
+        if slot is None:
+            slot = _host_slots[key] = threading.BoundedSemaphore(max(1, limit))
+        return slot
+
+
+# Bing跳转链接（bing.com/ck/a?...&u=a1...）中的u参数
+_BING_U_RE = re.compile(r'(?:https?:)?//[^/?#]*bing\.com[^?#]*\?(?:[^#]*?&)?u=([^&#]*)', re.I)
+
+# 文本标准化与文件名提取使用的正则（模块加载时编译一次）
+# 星号变体统一为*，冒号变体统一为:，括号和标点移除（ASCII的*和:本身不需要替换）
+_NORM_MAP = {
+    '＊': '*', '·': '*', '•': '*',
+    '：': ':',
+    '（': '', '）': '', '(': '', ')': '',
+    '，': '', ',': '', '。': '', '.': '',
+}
+_NORM_TABLE = str.maketrans(_NORM_MAP)
+_RE_FILENAME = re.compile(r"/([^/?#]+)(?:\?|#|$)")
+
+# 图片URL中常见的尺寸参数模式
+_RE_SIZE_PARAMS = tuple(re.compile(p) for p in (
+    r'w=(\d+)',  # width参数
+    r'width=(\d+)',  # width参数
+    r'h=(\d+)',  # height参数
+    r'height=(\d+)',  # height参数
+    r'size=(\d+)',  # size参数
+    r'dim=(\d+)',  # dimension参数
+))
+# 中文字符（CJK统一汉字基本区）
+_RE_CJK = re.compile('[\u4e00-\u9fff]')
+# 资源搜索中明显无关的标题关键词（子串匹配，每组合并为一个正则只扫描一遍标题）；
+# 中文关键词只可能出现在含中文的标题中，按字符范围分为两组
+_IRRELEVANT_ASCII = (
+    'login', 'register', 'home', 'about', 'contact', 'help', 'privacy', 'terms',
+    'ad', 'promotion', 'job', 'news', 'notice', 'update', 'maintenance'
+)
+_IRRELEVANT_CJK = (
+    '登录', '注册', '首页', '关于', '联系我们', '帮助', '隐私', '条款',
+    '广告', '推广', '招聘', '招聘信息', '新闻', '公告', '更新', '维护'
+)
+_RE_IRRELEVANT_ASCII = re.compile('|'.join(map(re.escape, _IRRELEVANT_ASCII)))
+_RE_IRRELEVANT_CJK = re.compile('|'.join(map(re.escape, _IRRELEVANT_CJK)))
+if AHOCORASICK_AVAILABLE:
+    # 两组关键词构建为一个自动机，扫描一遍小写后的标题即可判断是否命中任一关键词
+    _IRRELEVANT_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _IRRELEVANT_ASCII + _IRRELEVANT_CJK:
+        _IRRELEVANT_AUTOMATON.add_word(_keyword, _keyword)
+    _IRRELEVANT_AUTOMATON.make_automaton()
+    del _keyword
+# 资源网站结果中的翻页、更多等导航链接标题
+_NAV_TITLES = frozenset(('更多', 'more', '下一页', 'next', '上一页', 'prev'))
+# 小图片标识（子串匹配，w=12也会命中w=120，与原先逐个in判断一致）
+_RE_SMALL_IMAGE = re.compile('|'.join(map(re.escape, (
+    'w=12', 'h=12', 'w=16', 'h=16', 'w=24', 'h=24', 'w=32', 'h=32',
+    'size=12', 'size=16', 'size=24', 'size=32', 'size=48',
+    'thumb', 'icon', 'logo'  # thumb已包含thumbnail，icon已包含favicon
+))))
+
+
+@lru_cache(maxsize=4096)
+def _normalize_text(text: str) -> str:
+    """标准化文本，处理符号变体（纯函数，结果缓存）"""
+    # 都是单字符替换或删除，str.translate逐字符查表一遍完成（各类字符互不重叠，与逐类替换结果一致）
+    return text.translate(_NORM_TABLE).strip()
+
+
+@lru_cache(maxsize=4096)
+def _filename_from_url(url: str) -> str:
+    """从URL提取文件名（纯函数，结果缓存）"""
+    m = _RE_FILENAME.search(url)
+    if m:
+        return m.group(1)
+    return url
+
+
+# 预处理后的查询词：每次搜索只计算一次，供所有结果的相关性判断复用
+# quick_chars用于相关性打分前的快速排除：标准化只会把字符替换为*或:，
+# 因此查询字符中不含*和:时，与原始标题没有共同字符即说明标准化后也没有
+PreparedQuery = namedtuple('PreparedQuery', ['lower', 'words', 'norm', 'chars', 'quick_chars'])
+
+
+@lru_cache(maxsize=256)
+def _prepare_query(query: str) -> PreparedQuery:
+    """预处理查询词（小写、分词、标准化文本和字符集合）"""
+    lower = query.lower()
+    norm = _normalize_text(lower)
+    chars = frozenset(norm.replace(' ', ''))
+    quick_chars = chars if chars and not chars & {'*', ':'} else None
+    return PreparedQuery(lower, tuple(lower.split()), norm, chars, quick_chars)
+
+
+def _char_signature(chars) -> int:
+    """把字符集合映射为64位签名，用于标题相似度比较前的快速排除"""
+    sig = 0
+    for ch in chars:
+        sig |= 1 << (ord(ch) & 63)
+    return sig
+
+
+# 正则快速解析（settings.fast_parse）：直接在字节上匹配结果容器中的标题链接
+_BING_RESULT_RE = re.compile(rb'<li class="b_algo[^"]*"[^>]*>.*?<h2[^>]*>.*?<a [^>]*href="([^"]+)"[^>]*>(.*?)</a>', re.S)
+_STRIP_TAGS_RE = re.compile(rb'<[^>]+>')
+
+# Bing结果页只需解析结果容器（li.b_algo），广告、侧栏、脚本等节点不必构建
+_RESULT_STRAINER = SoupStrainer('li', attrs={'class': re.compile(r'b_algo')})
+
+# 搜索结果容器的候选选择器（按优先级排列）
+_RESULT_SELECTORS = (
+    'li.b_algo', 'li[class*="b_algo"]', '.b_algo',
+    'li[class*="algo"]', 'li[class*="result"]',
+    'div[class*="result"]', 'article', 'h2 a'
+)
+_RESULT_SELECTOR_ALL = soupsieve.compile(', '.join(_RESULT_SELECTORS))
+_RESULT_SELECTOR_EACH = tuple((sel, soupsieve.compile(sel)) for sel in _RESULT_SELECTORS)
+
+# 页面中的<template>标签（其内容不在Lexbor的文档树中）
+_TEMPLATE_TAG_RE = re.compile(rb'<template[\s/>]', re.I)
+
+@lru_cache(maxsize=256)
+def _lexbor_accepts(selector: str) -> bool:
+    """Lexbor能否解析该CSS选择器（soupsieve的扩展语法如[attr!=v]、:-soup-contains()不被支持）"""
+    try:
+        LexborHTMLParser('').css(selector)
+        return True
+    except Exception:
+        return False
+
+
+# 网站图片解析的候选元素：只选出带图片地址属性的img和带href的a，其余标签不进入Python循环
+_SITE_IMAGE_SELECTOR = soupsieve.compile('img[src], img[data-src], img[data-original], a[href]')
+
+
+def _select_result_groups(soup: BeautifulSoup):
+    """按优先级依次给出每个候选选择器匹配到的元素
+    
+    合并选择器只遍历一次DOM，再在匹配到的少量元素中按单个选择器分组，
+    结果与逐个调用soup.select(selector)相同
+    """
+    matched = _RESULT_SELECTOR_ALL.select(soup)
+    for selector, compiled in _RESULT_SELECTOR_EACH:
+        yield selector, [el for el in matched if compiled.match(el)]
+
+
+if LXML_AVAILABLE:
+    # 链接文本：与BeautifulSoup的get_text(strip=True)一致，不包含注释、脚本和样式内容
+    _LINK_TEXT_XPATH = lxml.etree.XPath('.//text()[not(parent::script or parent::style)]')
+    # 网站图片解析的候选元素（与_SITE_IMAGE_SELECTOR一致），一次C层遍历按文档顺序返回
+    _SITE_IMAGE_XPATH = lxml.etree.XPath('//img[@src or @data-src or @data-original] | //a[@href]')
+
+
+def _lxml_document(content: bytes):
+    """直接用lxml构建文档树，不再为每个标签创建BeautifulSoup对象
+    
+    先按BeautifulSoup相同的规则检测编码（meta声明、UTF-8等），
+    避免lxml在没有编码声明时把UTF-8页面按Latin-1解析；
+    解码后统一以UTF-8字节交给lxml，页面自带的编码声明不再生效
+    """
+    markup = UnicodeDammit(content, is_html=True).unicode_markup
+    # lxml的解析器对象不能在线程间并发使用，每次解析单独创建
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    return lxml.html.document_fromstring(markup.encode('utf-8'), parser=parser)
+
+
+def _bing_soup(content: bytes) -> BeautifulSoup:
+    """只解析Bing结果容器；页面结构变化导致没有匹配时回退到完整解析"""
+    soup = BeautifulSoup(content, _PARSER, parse_only=_RESULT_STRAINER)
+    if soup.find('li') is None:
+        soup = BeautifulSoup(content, _PARSER)
+    return soup
+
+
+_config_write_lock = threading.Lock()
+# 路径 -> 上次写入内容的(摘要, 修改时间, 大小)，用于跳过内容未变化的保存
+_config_written: Dict[str, Tuple[bytes, int, int]] = {}
+
+
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """解析配置文件，按(路径, 修改时间, 大小)缓存，文件未变化时不再重复解析"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # orjson不支持的内容（如超过64位的整数、NaN）回退到json，真正的格式错误由json报告
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_config_file(path: str) -> Dict[str, Any]:
+    """读取配置文件（返回的字典在各实例间共享，修改后需经_write_config_file保存）"""
+    st = os.stat(path)
+    return _parse_config_file(path, st.st_mtime_ns, st.st_size)
+
+
+def _dump_config(data: Dict[str, Any]) -> bytes:
+    """序列化配置（UTF-8、两空格缩进），orjson与json的输出格式相同"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # orjson不支持的内容（如超过64位的整数）回退到json
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _write_config_file(path: str, data: Dict[str, Any]) -> None:
+    """原子写入配置文件：先写临时文件再替换，避免并发保存或中途崩溃损坏配置
+    
+    内容与上次写入相同且文件未被外部修改时跳过写入
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with _config_write_lock:
+            # 在锁内序列化：多个线程同时保存共享的配置字典时，后取得锁的一方写入的一定是较新的内容
+            content = _dump_config(data)
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+            try:
+                st = os.stat(path)
+                if _config_written.get(path) == (digest, st.st_mtime_ns, st.st_size):
+                    return
+            except OSError:
+                pass
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            st = os.stat(path)
+            _config_written[path] = (digest, st.st_mtime_ns, st.st_size)
+    finally:
+        # 无论保存是否成功都丢弃解析缓存，之后的加载以磁盘内容为准
+        _parse_config_file.cache_clear()
+
+
+# 保存配置可能出现的错误：写文件失败，或配置中有无法序列化的值
+_CONFIG_SAVE_ERRORS = (OSError, TypeError, ValueError)
+
+
 class BaseSearch:
     """搜索基类，包含通用功能"""
     
@@ -56,11 +365,50 @@ class BaseSearch:
 
     ]
     
+    # URL去重时忽略的跟踪参数
+    IGNORED_QUERY_PARAMS = frozenset({
+        'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+        'spm', 'sourceid', 'ref', 'source', 'from'
+    })
+    
+    # 子类管理的配置中的网站列表键（如 "web_sites"）
+    SITE_KEY = ""
+    
+    # 网站类型 -> 配置中的网站列表键
+    SITE_TYPE_KEYS = {
+        'web': 'web_sites',
+        'images': 'image_sites',
+        'videos': 'video_sites',
+        'files': 'resource_sites',
+        'resources': 'resource_sites',
+    }
+    
+    # 单个响应默认最多读取的字节数（解压后，可通过settings.max_html_bytes调整）
+    MAX_RESPONSE_BYTES = 2_000_000
+    
+    # 默认最多同时保留的Selenium浏览器数量（可通过settings.selenium_pool_size调整）
+    SELENIUM_POOL_SIZE = 2
+    
+    # 代理请求失败后暂停使用的时间（秒）
+    PROXY_RETRY_AFTER = 60
+    
+    # 最多缓存多少个带ETag/Last-Modified的页面，用于条件请求（304时复用缓存内容）
+    CONDITIONAL_CACHE_SIZE = 64
+    # 条件请求缓存的页面内容总字节数上限（每个页面最多可达max_html_bytes，只按条数限制内存占用过大）
+    CONDITIONAL_CACHE_BYTES = 16_000_000
+    
+    # 网站管理操作后延迟写入配置文件的时间（秒）
+    SAVE_DELAY = 0.5
+    
+    # 黑名单匹配结果最多缓存的主机名数量（超过后清空重建）
+    BLACKLIST_CACHE_SIZE = 4096
+    
     # 无效链接模式
     INVALID_LINK_PATTERNS = [
         '#', 'javascript:void(0);', 'javascript:void(0)', 'javascript:',
         'mailto:', 'tel:', 'data:', 'about:', 'chrome:', 'file:'
     ]
+    INVALID_LINK_PREFIXES = tuple(INVALID_LINK_PATTERNS)  # str.startswith可直接接受元组
     
     def __init__(self, config_file: str = "sites_config.json"):
         """初始化搜索实例
@@ -70,14 +418,95 @@ class BaseSearch:
         """
         self.config_file = config_file
         self.config = self._load_config()
-        self.current_proxy_index = 0  # 当前代理索引
-        
-        # 基础配置
-        self.request_timeout = self.config.get("settings", {}).get("site_timeout", 10)  # 从配置文件读取超时时间
+        self._proxy_cfg_cache = None  # (文件修改时间, 代理配置)
+        self._proxy_cycle = None  # 启用代理URL的轮询迭代器
+        self._proxy_cycle_src = None  # 构建轮询迭代器时使用的代理配置
+        self._proxy_lock = threading.Lock()
+        self._proxy_failures: Dict[str, float] = {}  # 代理 -> 最近一次请求失败的时间
         
         # 正则表达式
         self.file_ext_regex = re.compile(r"\.(pdf|docx?|pptx?|xlsx?)($|\?|#)", re.I)
         self.archive_ext_regex = re.compile(r"\.(zip|rar|7z|iso|apk|exe)($|\?|#)", re.I)
+        
+        # 按搜索类型缓存的网站列表（搜索计划）、黑名单后缀及基础设置，配置变更时重建
+        self._site_plans: Dict[Any, List[Dict[str, Any]]] = {}
+        self._blacklist_enabled = True
+        self._blacklist_suffixes: tuple = ()
+        self._blacklist_suffix_set: frozenset = frozenset()
+        self._blacklist_suffix_lengths: tuple = ()
+        self._blacklist_domains: frozenset = frozenset()
+        self._blacklist_hosts: Dict[str, bool] = {}
+        self._site_domains: Dict[Tuple[str, str], frozenset] = {}
+        self._domain_categories: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self._rebuild_plans()
+        
+        # 复用的Selenium浏览器池，按需创建，程序退出时统一关闭
+        self._driver_pool: "queue.Queue" = queue.Queue()
+        self._driver_count = 0
+        self._driver_lock = threading.Lock()
+        atexit.register(self._close_drivers)
+        
+        # 延迟保存：标记有未写入的修改，由定时器或程序退出时统一写入
+        self._save_lock = threading.Lock()
+        self._save_pending = False
+        self._save_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush_config)
+        
+        # 按代理地址复用的请求会话（None为直连）
+        self._sessions: Dict[Optional[str], requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        
+        # 条件请求缓存：(URL, 参数) -> (验证头, 页面内容)，按最近使用淘汰
+        self._conditional_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._conditional_bytes = 0  # 缓存中页面内容的总字节数
+        self._conditional_lock = threading.Lock()
+        
+        # 实例共享的线程池，并发请求各网站（请求为IO密集，线程按需创建）
+        self._executor = ThreadPoolExecutor(max_workers=32)
+        # 多页搜索的分页请求单独使用一个线程池：调用方本身可能运行在_executor中，
+        # 在同一个线程池里等待子任务，线程占满时会互相等待而死锁
+        self._page_executor = ThreadPoolExecutor(max_workers=8)
+
+    def _rebuild_plans(self) -> None:
+        """配置变更后丢弃派生的搜索计划，下次搜索时按新配置重新生成，并重建黑名单索引和设置快照"""
+        self._site_plans = {}
+        
+        # 基础配置：搜索过程中只读取这些属性，不再逐层查找配置字典
+        settings = self.config.get("settings", {})
+        self.request_timeout = settings.get("site_timeout", 10)  # 单个请求的超时时间
+        self.site_timeout = settings.get("site_timeout", 8)  # 并发搜索时每个网站的超时时间
+        self.engine_max_results = settings.get("engine_max_results", 35)  # 搜索引擎每页结果数
+        self.fast_parse = bool(settings.get("fast_parse", False))  # 是否先尝试正则快速解析
+        self.max_per_host = settings.get("max_per_host", 4)  # 单个网站的最大并发请求数
+        self.selenium_pool_size = settings.get("selenium_pool_size", self.SELENIUM_POOL_SIZE)  # 可同时渲染的浏览器数量
+        self.max_response_bytes = settings.get("max_html_bytes", self.MAX_RESPONSE_BYTES)  # 单个响应最多读取的字节数
+        self.verify_ssl = bool(settings.get("verify_ssl", True))  # 是否校验HTTPS证书
+        # 不校验证书的网站：只匹配域名本身及其子域名，不匹配 evilexample.com 这类相似主机
+        insecure = {d.lower().strip('.') for d in settings.get("insecure_domains", []) if d and d.strip('.')}
+        self._insecure_hosts = frozenset(insecure)
+        self._insecure_suffixes = tuple('.' + d for d in insecure)
+        
+        blacklist = self.config.get("blacklist", {})
+        self._blacklist_enabled = bool(blacklist.get("enabled", True))
+        self._blacklist_suffixes = tuple(d.lower() for d in blacklist.get("domains", []) if d)
+        # 后缀匹配只需按黑名单中出现过的长度截取主机名末尾查集合，次数与黑名单条目数无关
+        self._blacklist_suffix_set = frozenset(self._blacklist_suffixes)
+        self._blacklist_suffix_lengths = tuple(sorted({len(d) for d in self._blacklist_suffix_set}))
+        self._blacklist_domains = frozenset(blacklist.get("domains", []))  # 配置中仍保存为列表，成员判断用集合
+        self._blacklist_hosts = {}  # 主机名 -> 是否命中黑名单
+        
+        # 各分类域名列表的集合索引：(配置键, 分类) -> 域名集合，配置中仍保存为列表
+        self._site_domains = {
+            (key, category): frozenset(sites.get("domains", []))
+            for key in set(self.SITE_TYPE_KEYS.values())
+            for category, sites in self.config.get(key, {}).items()
+        }
+        # 反向索引：(配置键, 域名) -> 包含该域名的分类（按配置顺序），查询网站所属分类不再遍历所有分类
+        domain_categories: Dict[Tuple[str, str], List[str]] = {}
+        for (key, category), domains in self._site_domains.items():
+            for domain in domains:
+                domain_categories.setdefault((key, domain), []).append(category)
+        self._domain_categories = {k: tuple(v) for k, v in domain_categories.items()}
 
     def _load_config(self) -> Dict[str, Any]:
         """加载网站配置
@@ -87,15 +516,14 @@ class BaseSearch:
         """
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return _read_config_file(self.config_file)
         except Exception as e:
-            print(f"[DEBUG] 加载配置失败: {e}")
+            logger.warning("加载配置失败: %s", e)
         
         # 返回默认配置 - 使用main.py中的DEFAULT_CONFIG
         try:
             from main import DEFAULT_CONFIG
-            return DEFAULT_CONFIG.copy()
+            return copy.deepcopy(DEFAULT_CONFIG)
         except ImportError:
             # 如果无法导入，返回最小配置
             return {
@@ -109,13 +537,67 @@ class BaseSearch:
             }
 
     def _save_config(self) -> None:
-        """保存配置到文件"""
+        """保存配置到文件（同时写入之前延迟保存的修改）"""
+        with self._save_lock:
+            self._save_pending = False
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+            _write_config_file(self.config_file, self.config)
         except Exception as e:
-            print(f"[DEBUG] 保存配置失败: {e}")
+            logger.warning("保存配置失败: %s", e)
             raise e  # 重新抛出异常，让调用方知道保存失败
+        finally:
+            # 内存中的配置已被修改，派生的索引需要同步
+            self._rebuild_plans()
+
+    def _has_site_domain(self, key: str, category: str, domain: str) -> bool:
+        """域名是否已在指定网站类型配置的分类中（查集合索引，不扫描域名列表）"""
+        return domain in self._site_domains.get((key, category), ())
+
+    def _site_categories(self, key: str, domain: str) -> Tuple[str, ...]:
+        """域名所在的全部分类（查反向索引）"""
+        return self._domain_categories.get((key, domain), ())
+
+    def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
+        """切换网站启用状态（兼容按网站类型调用，只处理本类管理的类型）"""
+        if self.SITE_TYPE_KEYS.get(site_type) == self.SITE_KEY:
+            self.toggle(domain, enabled)
+
+    def get_site_search_urls(self, site_type: str, domain: str) -> list:
+        """获取指定网站的搜索URL（兼容按网站类型调用）"""
+        if self.SITE_TYPE_KEYS.get(site_type) != self.SITE_KEY:
+            return []
+        return self.get_search_urls(domain)
+
+    def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
+        """更新指定网站的搜索URL（兼容按网站类型调用）"""
+        if self.SITE_TYPE_KEYS.get(site_type) == self.SITE_KEY:
+            self.update_search_urls(domain, search_urls)
+
+    def _schedule_save(self) -> None:
+        """延迟保存配置：立即同步派生索引，短时间内的连续修改（如批量启用/禁用网站）合并为一次写入"""
+        self._rebuild_plans()
+        with self._save_lock:
+            self._save_pending = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush_config)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush_config(self) -> None:
+        """立即写入尚未保存的配置修改（延迟保存到期或程序退出时调用）"""
+        with self._save_lock:
+            timer, self._save_timer = self._save_timer, None
+            pending, self._save_pending = self._save_pending, False
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return
+        try:
+            _write_config_file(self.config_file, self.config)
+        except Exception as e:
+            logger.warning("保存配置失败: %s", e)
+            with self._save_lock:
+                self._save_pending = True  # 保留修改标记，下次保存或退出时重试
 
     def _load_proxy_config(self) -> Dict[str, Any]:
         """加载代理配置
@@ -124,12 +606,30 @@ class BaseSearch:
             代理配置字典
         """
         try:
-            if os.path.exists('proxy_config.json'):
+            mtime = os.path.getmtime('proxy_config.json')
+        except OSError:
+            mtime = None
+        
+        # 文件未修改时直接使用缓存，避免每次请求都读取并解析JSON
+        cached = self._proxy_cfg_cache
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        data = None
+        try:
+            if mtime is not None:
                 with open('proxy_config.json', 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
         except Exception as e:
-            print(f"[DEBUG] 加载代理配置失败: {e}")
+            logger.warning("加载代理配置失败: %s", e)
         
+        if data is None:
+            data = self._default_proxy_config()
+        self._proxy_cfg_cache = (mtime, data)
+        return data
+
+    def _default_proxy_config(self) -> Dict[str, Any]:
+        """默认代理配置（未启用代理）"""
         return {
             "proxy_settings": {
                 "enabled": False,
@@ -146,30 +646,45 @@ class BaseSearch:
             代理URL或None
         """
         proxy_config = self._load_proxy_config()
+        
+        with self._proxy_lock:
+            # 代理配置文件变化后（缓存对象被替换）重新构建轮询迭代器
+            if proxy_config is not self._proxy_cycle_src:
+                proxy_urls = self._build_proxy_urls(proxy_config)
+                self._proxy_cycle = itertools.cycle(proxy_urls) if proxy_urls else None
+                self._proxy_cycle_src = proxy_config
+            
+            if self._proxy_cycle is None:
+                return None
+            return next(self._proxy_cycle)
+
+    def _build_proxy_urls(self, proxy_config: Dict[str, Any]) -> List[str]:
+        """根据代理配置生成所有启用代理的URL列表
+        
+        Returns:
+            代理URL列表，未启用代理时为空列表
+        """
         if not proxy_config.get("proxy_settings", {}).get("enabled", False):
-            return None
+            return []
         
         proxies = proxy_config.get("proxy_settings", {}).get("proxies", [])
-        if not proxies:
-            return None
         
+        proxy_urls = []
         # 过滤启用的代理
-        enabled_proxies = [p for p in proxies if p.get("enabled", False)]
-        if not enabled_proxies:
-            return None
-        
-        proxy = enabled_proxies[self.current_proxy_index]
-        self.current_proxy_index = (self.current_proxy_index + 1) % len(enabled_proxies)
-        
-        # 构建代理URL
-        proxy_url = proxy.get("url", "")
-        if proxy.get("username") and proxy.get("password"):
-            # 如果有认证信息，添加到URL中
-            if "://" in proxy_url:
-                protocol, rest = proxy_url.split("://", 1)
-                proxy_url = f"{protocol}://{proxy.get('username')}:{proxy.get('password')}@{rest}"
+        for proxy in proxies:
+            if not proxy.get("enabled", False):
+                continue
+            
+            # 构建代理URL
+            proxy_url = proxy.get("url", "")
+            if proxy.get("username") and proxy.get("password"):
+                # 如果有认证信息，添加到URL中
+                if "://" in proxy_url:
+                    protocol, rest = proxy_url.split("://", 1)
+                    proxy_url = f"{protocol}://{proxy.get('username')}:{proxy.get('password')}@{rest}"
+            proxy_urls.append(proxy_url)
         
-        return proxy_url
+        return proxy_urls
 
     def _test_proxy(self, proxy_url: str) -> bool:
         """测试代理是否可用
@@ -191,50 +706,81 @@ class BaseSearch:
             
             response = requests.get(test_url, proxies=proxies, timeout=10)
             if response.status_code == 200:
-                print(f"[DEBUG] 代理测试成功: {proxy_url}")
+                logger.debug("代理测试成功: %s", proxy_url)
                 return True
             else:
-                print(f"[DEBUG] 代理测试失败: {proxy_url}, 状态码: {response.status_code}")
+                logger.debug("代理测试失败: %s, 状态码: %s", proxy_url, response.status_code)
                 return False
         except Exception as e:
-            print(f"[DEBUG] 代理测试异常: {proxy_url}, 错误: {e}")
+            logger.debug("代理测试异常: %s, 错误: %s", proxy_url, e)
             return False
 
-    def _session(self) -> requests.Session:
-        """创建请求会话
+    def _build_session(self, proxy: Optional[str]) -> requests.Session:
+        """创建请求会话（User-Agent在每次请求时单独设置）
         
+        Args:
+            proxy: 代理地址，None表示直连
+            
         Returns:
-            配置好的requests会话对象
+            配置好连接池的requests会话对象
         """
         s = requests.Session()
         
-        # 随机选择User-Agent
-        user_agent = random.choice(self.USER_AGENTS)
         s.headers.update({
-            "User-Agent": user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-            "Accept-Encoding": "gzip, deflate",
+            "Accept-Encoding": "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate",
             "Cache-Control": "no-cache",
             "Pragma": "no-cache",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
         })
         
-        # 设置代理（如果有的话）
+        # 连接池复用TCP/TLS连接（keep-alive），避免每次搜索重新握手；
+        # 建立连接失败或被限流/网关错误（429/5xx）时退避后重试一次，读超时不重试，以免拖慢整次搜索
+        retries = Retry(
+            total=2, connect=1, read=0, status=1,
+            status_forcelist=(429, 502, 503, 504),
+            backoff_factor=0.3,
+            respect_retry_after_header=False,  # 不按Retry-After长时间等待
+            raise_on_status=False,  # 重试后仍失败时返回最后的响应，由调用方按状态码处理
+        )
+        # pool_connections是按主机缓存的连接池数量，并发访问的网站多于该数量时最早的连接池会被丢弃，
+        # 按共享线程池可同时访问的网站数留出余量
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=retries)
+        s.mount('http://', adapter)
+        s.mount('https://', adapter)
+        
+        if proxy:
+            s.proxies = {
+                'http': proxy,
+                'https': proxy
+            }
+        
+        # 默认校验证书（requests自带的certifi证书包），个别证书有问题的网站在_send中按设置单独跳过
+        s.verify = True
+        return s
+
+    def _session(self) -> requests.Session:
+        """获取请求会话，按代理复用同一个会话及其连接池
+        
+        Returns:
+            配置好的requests会话对象
+        """
+        # 设置代理（如果有的话），不预先测试，请求失败时再标记不可用
         proxy = self._get_next_proxy()
         if proxy:
-            # 测试代理可用性
-            if self._test_proxy(proxy):
-                s.proxies = {
-                    'http': proxy,
-                    'https': proxy
-                }
-                print(f"[DEBUG] 使用代理: {proxy}")
+            failed_at = self._proxy_failures.get(proxy)
+            if failed_at is not None and time.time() - failed_at < self.PROXY_RETRY_AFTER:
+                logger.debug("代理不可用，跳过: %s", proxy)
+                proxy = None
             else:
-                print(f"[DEBUG] 代理不可用，跳过: {proxy}")
+                logger.debug("使用代理: %s", proxy)
         
-        s.verify = False
+        with self._sessions_lock:
+            s = self._sessions.get(proxy)
+            if s is None:
+                s = self._sessions[proxy] = self._build_session(proxy)
         return s
 
     def _create_selenium_driver(self) -> Optional[webdriver.Chrome]:
@@ -296,7 +842,7 @@ class BaseSearch:
             
             return driver
         except Exception as e:
-            print(f"[DEBUG] 创建Selenium WebDriver失败: {e}")
+            logger.debug("创建Selenium WebDriver失败: %s", e)
             return None
 
     def _request_with_selenium(self, url: str) -> Optional[str]:
@@ -308,12 +854,13 @@ class BaseSearch:
         Returns:
             页面HTML内容或None
         """
-        driver = self._create_selenium_driver()
+        driver = self._acquire_driver()
         if not driver:
             return None
-            
+        
+        broken = False
         try:
-            print(f"[DEBUG] Selenium请求URL: {url}")
+            logger.debug("Selenium请求URL: %s", url)
             driver.get(url)
             
             # 等待页面加载完成
@@ -325,19 +872,77 @@ class BaseSearch:
             
             # 获取页面源码
             html = driver.page_source
-            print(f"[DEBUG] Selenium响应: 内容长度 {len(html)}")
+            logger.debug("Selenium响应: 内容长度 %s", len(html))
             return html
             
         except TimeoutException:
-            print(f"[DEBUG] Selenium请求超时: {url}")
+            logger.debug("Selenium请求超时: %s", url)
             return None
         except Exception as e:
-            print(f"[DEBUG] Selenium请求失败: {e}")
+            logger.debug("Selenium请求失败: %s", e)
+            # 浏览器本身出错时不再放回池中
+            broken = isinstance(e, WebDriverException)
             return None
         finally:
+            self._release_driver(driver, broken)
+
+    def _acquire_driver(self) -> Optional["webdriver.Chrome"]:
+        """从浏览器池中取出一个WebDriver，池未满时新建
+        
+        Returns:
+            Chrome WebDriver实例或None
+        """
+        try:
+            return self._driver_pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._driver_lock:
+            create = self._driver_count < max(1, self.selenium_pool_size)
+            if create:
+                self._driver_count += 1
+        
+        if create:
+            driver = self._create_selenium_driver()
+            if driver is None:
+                with self._driver_lock:
+                    self._driver_count -= 1
+            return driver
+        
+        # 池已满，等待其他请求归还浏览器
+        try:
+            return self._driver_pool.get(timeout=30)
+        except queue.Empty:
+            logger.debug("等待Selenium浏览器超时")
+            return None
+
+    def _release_driver(self, driver: "webdriver.Chrome", broken: bool = False) -> None:
+        """归还WebDriver到浏览器池，出错的浏览器直接退出"""
+        if not broken:
+            try:
+                driver.delete_all_cookies()
+                self._driver_pool.put(driver)
+                return
+            except Exception:
+                pass
+        
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._driver_lock:
+            self._driver_count -= 1
+
+    def _close_drivers(self) -> None:
+        """退出浏览器池中的所有WebDriver（程序退出时调用）"""
+        while True:
+            try:
+                driver = self._driver_pool.get_nowait()
+            except queue.Empty:
+                break
             try:
                 driver.quit()
-            except:
+            except Exception:
                 pass
 
     def _request(self, session: requests.Session, url: str, 
@@ -370,40 +975,147 @@ class BaseSearch:
                 return MockResponse(html)
         
         try:
-            print(f"[DEBUG] 请求URL: {url}")
+            logger.debug("请求URL: %s", url)
             
             # 对于百度等国内网站，使用更长的超时时间
             timeout = self.request_timeout
             if 'baidu.com' in url or 'sogou.com' in url or 'so.com' in url:
                 timeout = 15  # 国内网站使用15秒超时
             
-            resp = session.get(url, params=params, headers=headers, timeout=timeout)
-            print(f"[DEBUG] 响应状态: {resp.status_code}, 内容长度: {len(resp.content)}")
+            # 会话在线程间共享，User-Agent随每次请求轮换
+            request_headers = {"User-Agent": random.choice(self.USER_AGENTS)}
+            if headers:
+                request_headers.update(headers)
             
-            # 处理重定向
-            if resp.status_code in (301, 302, 303, 307, 308):
-                loc = resp.headers.get('Location')
-                if loc:
-                    resp = session.get(loc, timeout=timeout)
+            # 之前请求过且服务器给出了ETag/Last-Modified时，发送条件请求
+            cache_key = (url, tuple(sorted(params.items())) if params else ())
+            with self._conditional_lock:
+                cached = self._conditional_cache.get(cache_key)
+            if cached is not None:
+                request_headers.update(cached[0])
+            
+            try:
+                resp = self._send(session, url, params, request_headers, timeout)
+            except requests.exceptions.ConnectionError:
+                # 代理连接失败（ProxyError也属于ConnectionError）：标记该代理并换一个会话重试一次
+                proxy = session.proxies.get('https')
+                if not proxy:
+                    raise
+                logger.debug("代理请求失败，暂停使用并重试: %s", proxy)
+                self._proxy_failures[proxy] = time.time()
+                resp = self._send(self._session(), url, params, request_headers, timeout)
+            
+            if resp.status_code == 304 and cached is not None:
+                # 页面未变化：直接使用缓存的内容，省去下载
+                logger.debug("页面未修改，使用缓存内容: %s", url)
+                with self._conditional_lock:
+                    if cache_key in self._conditional_cache:
+                        self._conditional_cache.move_to_end(cache_key)
+                resp.status_code = 200
+                resp._content = cached[1]
+                return resp
             
-            if resp.status_code == 200:
+            if resp.status_code == 200 and resp.content:
+                self._remember_validators(cache_key, resp)
                 return resp
             else:
-                print(f"[DEBUG] 请求失败，状态码: {resp.status_code}")
+                logger.debug("请求失败，状态码: %s", resp.status_code)
                 return None
                 
         except requests.exceptions.ConnectionError as e:
-            print(f"[DEBUG] 连接错误: {e}")
+            logger.debug("连接错误: %s", e)
             return None
                     
         except requests.exceptions.Timeout as e:
-            print(f"[DEBUG] 请求超时: {e}")
+            logger.debug("请求超时: %s", e)
             return None
                     
         except Exception as e:
-            print(f"[DEBUG] 请求失败: {e}")
+            logger.debug("请求失败: %s", e)
             return None
 
+    def _remember_validators(self, cache_key: tuple, resp: requests.Response) -> None:
+        """记录响应的ETag/Last-Modified及内容，供下次条件请求使用"""
+        validators = {}
+        etag = resp.headers.get('ETag')
+        if etag:
+            validators['If-None-Match'] = etag
+        last_modified = resp.headers.get('Last-Modified')
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+        
+        content = resp.content
+        with self._conditional_lock:
+            old = self._conditional_cache.pop(cache_key, None)
+            if old is not None:
+                self._conditional_bytes -= len(old[1])
+            # 服务器不再提供验证头时丢弃旧的缓存；超过总字节上限的单个页面不缓存
+            if not validators or len(content) > self.CONDITIONAL_CACHE_BYTES:
+                return
+            self._conditional_cache[cache_key] = (validators, content)
+            self._conditional_bytes += len(content)
+            while (len(self._conditional_cache) > self.CONDITIONAL_CACHE_SIZE
+                   or self._conditional_bytes > self.CONDITIONAL_CACHE_BYTES):
+                _, (_, evicted) = self._conditional_cache.popitem(last=False)
+                self._conditional_bytes -= len(evicted)
+
+    def _send(self, session: requests.Session, url: str, params: Optional[Dict[str, Any]],
+              headers: Dict[str, str], timeout: int) -> requests.Response:
+        """在并发限制内发送GET请求，并逐跳跟随重定向
+        
+        重定向不交给requests自动跟随：每一跳都按目标主机重新判断是否校验证书，
+        避免不校验证书的网站把请求转到其他主机后也跳过校验
+        """
+        host = (urlparse(url).hostname or '').lower()
+        with _request_slots, _host_slot(host, self.max_per_host):
+            resp = session.get(url, params=params, headers=headers, timeout=timeout, stream=True,
+                               verify=self._verify_for(host), allow_redirects=False)
+            
+            # 处理重定向
+            hops = 0
+            while resp.status_code in (301, 302, 303, 307, 308):
+                loc = resp.headers.get('Location')
+                if not loc:
+                    break
+                hops += 1
+                if hops > session.max_redirects:
+                    resp.close()
+                    raise requests.TooManyRedirects(f"超过 {session.max_redirects} 次重定向", response=resp)
+                loc = urljoin(resp.url, loc)
+                resp.close()
+                loc_host = (urlparse(loc).hostname or '').lower()
+                resp = session.get(loc, headers=headers, timeout=timeout, stream=True,
+                                   verify=self._verify_for(loc_host), allow_redirects=False)
+            
+            self._read_body(resp)
+            logger.debug("响应状态: %s, 内容长度: %s", resp.status_code, len(resp.content))
+        return resp
+
+    def _verify_for(self, host: str) -> bool:
+        """是否校验该主机的HTTPS证书（settings.verify_ssl为false或主机在insecure_domains中时不校验）"""
+        return self.verify_ssl and not (host in self._insecure_hosts or host.endswith(self._insecure_suffixes))
+
+    def _read_body(self, resp: requests.Response) -> None:
+        """按上限读取响应体，非文本类型（PDF、压缩包等）不读取内容"""
+        content_type = resp.headers.get('Content-Type', '').lower()
+        if content_type and not (content_type.startswith('text/') or 'html' in content_type
+                                 or 'xml' in content_type or 'json' in content_type):
+            logger.debug("跳过非文本响应: %s", content_type)
+            body = b''
+            resp.close()
+        else:
+            limit = self.max_response_bytes
+            body = resp.raw.read(limit + 1, decode_content=True) or b''
+            if len(body) > limit:
+                logger.debug("响应超过 %s 字节，已截断", limit)
+                body = body[:limit]
+                resp.close()  # 未读完的连接不能放回连接池
+            else:
+                resp.raw.release_conn()
+        
+        resp._content = body
+        resp._content_consumed = True
+
     def _unwrap_bing_url(self, bing_url: str) -> str:
         """从Bing跳转链接中提取真实URL（参考Go代码实现）
         
@@ -413,37 +1125,29 @@ class BaseSearch:
         Returns:
             真实URL或原URL
         """
+        # 一次匹配同时确认是Bing链接并取出u参数，避免完整解析URL和查询字符串
+        m = _BING_U_RE.match(bing_url)
+        if not m or not m.group(1):
+            return bing_url
+        
+        enc = m.group(1)
+        if '%' in enc:
+            enc = unquote(enc)
+        
+        # 去掉前缀（如果存在）
+        if enc.startswith('a1'):
+            enc = enc[2:]
+        
+        # base64解码，按长度补齐padding
         try:
-            from urllib.parse import urlparse, parse_qs, unquote
-            import base64
-            
-            u = urlparse(bing_url)
-            if 'bing.com' not in (u.netloc or ''):
-                return bing_url
-            
-            # 获取u参数
-            enc = u.query and parse_qs(u.query).get('u', [None])[0]
-            if not enc:
-                return bing_url
-            
-            # 去掉前缀（如果存在）
-            if enc.startswith('a1'):
-                enc = enc[2:]
-            
-            # base64解码
-            try:
-                decoded = base64.urlsafe_b64decode(enc + '==')  # 添加padding
-                real_url = decoded.decode('utf-8')
-                if real_url.startswith('http'):
-                    print(f"[DEBUG] Bing URL解包: {bing_url} -> {real_url}")
-                    return real_url
-            except Exception as e:
-                print(f"[DEBUG] Bing URL解码失败: {e}")
-                pass
-                
+            decoded = base64.urlsafe_b64decode(enc + '=' * (-len(enc) % 4))
+            real_url = decoded.decode('utf-8')
+            if real_url.startswith('http'):
+                logger.debug("Bing URL解包: %s -> %s", bing_url, real_url)
+                return real_url
         except Exception as e:
-            print(f"[DEBUG] Bing URL解包异常: {e}")
-            
+            logger.debug("Bing URL解码失败: %s", e)
+        
         return bing_url
 
     def _normalize_url(self, href: Optional[str]) -> Optional[str]:
@@ -492,13 +1196,8 @@ class BaseSearch:
         
         href_lower = href.lower().strip()
         
-        # 检查是否匹配无效模式
-        for pattern in self.INVALID_LINK_PATTERNS:
-            if href_lower.startswith(pattern):
-                return True
-        
-        # 检查是否是纯锚点或空链接
-        if href_lower in ['#', 'javascript:void(0);', 'javascript:void(0)']:
+        # 检查是否匹配无效模式（纯锚点、javascript:void(0)等也以这些前缀开头）
+        if href_lower.startswith(self.INVALID_LINK_PREFIXES):
             return True
         
         # 检查是否是相对路径但指向无效位置
@@ -521,7 +1220,9 @@ class BaseSearch:
         
         dedup = []
         seen_urls = set()
+        seen_url_keys = {}  # 规范化URL键 -> 首次出现的URL
         seen_titles = set()
+        seen_title_sigs = []  # (标准化标题, 字符集合, 字符签名)，均只计算一次
         
         for item in results:
             url = item.get("url", "").strip()
@@ -532,113 +1233,72 @@ class BaseSearch:
             
             # 1. URL完全匹配去重
             if url in seen_urls:
-                print(f"[DEBUG] 过滤重复URL: {url}")
+                logger.debug("过滤重复URL: %s", url)
                 continue
             
             # 2. 标题相似度去重
-            title_normalized = self._normalize_text(title.lower())
+            title_normalized = _normalize_text(title.lower())
             if title_normalized in seen_titles:
-                print(f"[DEBUG] 过滤重复标题: {title}")
+                logger.debug("过滤重复标题: %s", title)
                 continue
             
-            # 3. 检查URL相似度（处理参数差异）
-            url_similar = False
-            for seen_url in seen_urls:
-                if self._are_urls_similar(url, seen_url):
-                    print(f"[DEBUG] 过滤相似URL: {url} (相似于: {seen_url})")
-                    url_similar = True
-                    break
-            
-            if url_similar:
+            # 3. 检查URL相似度（处理参数差异），按规范化键一次查找
+            url_key = self._url_key(url)
+            if url_key is not None and url_key in seen_url_keys:
+                logger.debug("过滤相似URL: %s (相似于: %s)", url, seen_url_keys[url_key])
                 continue
             
             # 4. 检查标题相似度（处理符号变体）
+            title_chars = set(title_normalized)
+            title_sig = _char_signature(title_chars)
             title_similar = False
-            for seen_title in seen_titles:
-                if self._are_titles_similar(title_normalized, seen_title):
-                    print(f"[DEBUG] 过滤相似标题: {title} (相似于: {seen_title})")
-                    title_similar = True
-                    break
+            if title_chars:
+                for seen_title, seen_chars, seen_sig in seen_title_sigs:
+                    if not seen_chars:
+                        continue
+                    # 签名异或的位数是对称差大小的下界，Jaccard > 0.8 要求对称差 < (|A|+|B|)/9，
+                    # 不满足时无需再做集合运算
+                    if bin(title_sig ^ seen_sig).count('1') * 9 >= len(title_chars) + len(seen_chars):
+                        continue
+                    if len(title_chars & seen_chars) / len(title_chars | seen_chars) > 0.8:
+                        logger.debug("过滤相似标题: %s (相似于: %s)", title, seen_title)
+                        title_similar = True
+                        break
             
             if title_similar:
                 continue
             
             # 通过所有检查，添加到结果中
             seen_urls.add(url)
+            if url_key is not None:
+                seen_url_keys[url_key] = url
             seen_titles.add(title_normalized)
+            seen_title_sigs.append((title_normalized, title_chars, title_sig))
             dedup.append(item)
         
-        print(f"[DEBUG] 智能去重: {len(results)} -> {len(dedup)} 条结果")
+        logger.debug("智能去重: %s -> %s 条结果", len(results), len(dedup))
         return dedup
 
-    def _are_urls_similar(self, url1: str, url2: str) -> bool:
-        """检查两个URL是否相似
+    def _url_key(self, url: str) -> Optional[tuple]:
+        """计算URL的规范化键，域名、路径及非跟踪参数都相同的URL视为相似
         
         Args:
-            url1: 第一个URL
-            url2: 第二个URL
+            url: 待计算的URL
             
         Returns:
-            是否相似
+            规范化键，URL无法解析时返回None
         """
         try:
-            from urllib.parse import urlparse, parse_qs
-            
-            # 解析URL
-            p1 = urlparse(url1)
-            p2 = urlparse(url2)
-            
-            # 比较域名和路径
-            if p1.netloc != p2.netloc or p1.path != p2.path:
-                return False
-            
-            # 比较查询参数（忽略某些参数）
-            q1 = parse_qs(p1.query)
-            q2 = parse_qs(p2.query)
-            
-            # 忽略的参数
-            ignore_params = {'utm_source', 'utm_medium', 'utm_campaign', 'ref', 'source', 'from'}
-            
-            # 移除忽略的参数
-            for param in ignore_params:
-                q1.pop(param, None)
-                q2.pop(param, None)
-            
-            # 比较剩余参数
-            return q1 == q2
-            
+            pu = urlparse(url)
+            params = parse_qs(pu.query)
         except Exception:
-            return False
-
-    def _are_titles_similar(self, title1: str, title2: str) -> bool:
-        """检查两个标题是否相似
-        
-        Args:
-            title1: 第一个标题
-            title2: 第二个标题
-            
-        Returns:
-            是否相似
-        """
-        if not title1 or not title2:
-            return False
-        
-        # 计算字符相似度
-        def similarity(s1: str, s2: str) -> float:
-            if not s1 or not s2:
-                return 0.0
-            
-            # 使用集合计算Jaccard相似度
-            set1 = set(s1)
-            set2 = set(s2)
-            
-            intersection = len(set1 & set2)
-            union = len(set1 | set2)
-            
-            return intersection / union if union > 0 else 0.0
+            return None
         
-        sim = similarity(title1, title2)
-        return sim > 0.8  # 相似度阈值
+        return (
+            pu.netloc,
+            pu.path,
+            tuple(sorted((k, tuple(v)) for k, v in params.items() if k not in self.IGNORED_QUERY_PARAMS))
+        )
 
     def _clean_title(self, title: str, href: str, site: str) -> str:
         """清理和优化标题"""
@@ -657,7 +1317,7 @@ class BaseSearch:
         
         # 移除纯域名标题
         if title.endswith(('.com', '.cn', '.net', '.org')):
-            title = self._filename_from_url(href)
+            title = _filename_from_url(href)
         
         # 移除无用前缀
         prefixes_to_remove = [
@@ -677,40 +1337,45 @@ class BaseSearch:
         
         return title
 
-    def _filename_from_url(self, url: str) -> str:
-        """从URL提取文件名"""
-        try:
-            m = re.search(r"/([^/?#]+)(?:\?|#|$)", url)
-            if m:
-                return m.group(1)
-        except Exception:
-            pass
-        return url
-
     def _is_blacklisted(self, url: str) -> bool:
-        """检查URL是否在黑名单中"""
-        if not self.config.get("blacklist", {}).get("enabled", True):
+        """检查URL是否在黑名单中（按域名后缀匹配）"""
+        if not self._blacklist_enabled or not self._blacklist_suffixes:
             return False
         
         try:
-            pu = urlparse(url)
-            host = (pu.netloc or '').lower()
-            blacklist_domains = self.config.get("blacklist", {}).get("domains", [])
-            for domain in blacklist_domains:
-                if domain in host:
-                        return True
+            host = urlparse(url).hostname or ''
         except Exception:
-            pass
-        return False
+            return False
+        
+        # 搜索结果中的主机名大量重复，按主机名缓存匹配结果，黑名单变更时随_rebuild_plans清空
+        blocked = self._blacklist_hosts.get(host)
+        if blocked is None:
+            if len(self._blacklist_hosts) >= self.BLACKLIST_CACHE_SIZE:
+                self._blacklist_hosts.clear()
+            suffix_set = self._blacklist_suffix_set
+            blocked = self._blacklist_hosts[host] = any(
+                host[-n:] in suffix_set for n in self._blacklist_suffix_lengths if n <= len(host)
+            )
+        return blocked
 
 
 class WebSearch(BaseSearch):
     """网页搜索类"""
     
+    # 本类管理的配置中的网站列表键
+    SITE_KEY = "web_sites"
+    
     BING_INTERNAL_PATHS = (
         "/search", "/images/", "/videos/", "/academic/", "/maps/", "/travel/", "/dict/"
     )
     
+    # 概念性、官网类内容关键词（相关性打分加分）
+    OFFICIAL_KEYWORDS = (
+        '官网', '官方网站', 'official', 'homepage', 'home page',
+        '概念', '介绍', 'introduction', 'about', '什么是', 'what is',
+        '定义', 'definition', '百科', 'wiki', '萌娘百科'
+    )
+    
     def __init__(self, config_file: str = "sites_config.json"):
         super().__init__(config_file)
         self.search_type = "web"
@@ -731,58 +1396,38 @@ class WebSearch(BaseSearch):
             pass
         return False
 
-    def _basic_keyword_match(self, query: str, title: str, url: str) -> bool:
+    def _basic_keyword_match(self, pq: PreparedQuery, title: str, url: str) -> bool:
         """基本关键词匹配"""
-        query_lower = query.lower()
-        title_lower = title.lower()
-        url_lower = url.lower()
-        
-        query_words = query_lower.split()
-        title_text = title_lower + ' ' + url_lower
+        title_text = title.lower() + ' ' + url.lower()
         
         return (
-            query_lower in title_text or  # 完整查询词在标题或URL中
-            any(word in title_text for word in query_words)  # 查询词中的任何词在标题或URL中
+            pq.lower in title_text or  # 完整查询词在标题或URL中
+            any(word in title_text for word in pq.words)  # 查询词中的任何词在标题或URL中
         )
 
-    def _normalize_text(self, text: str) -> str:
-        """标准化文本，处理符号变体"""
-        import re
-        # 替换常见的符号变体
-        text = re.sub(r'[＊*·•·]', '*', text)  # 统一星号变体
-        text = re.sub(r'[：:]', ':', text)      # 统一冒号变体
-        text = re.sub(r'[（）()]', '', text)    # 移除括号
-        text = re.sub(r'[，,。.]', '', text)    # 移除标点
-        return text.strip()
-    
-    def _super_loose_match(self, query: str, title: str) -> bool:
+    def _super_loose_match(self, pq: PreparedQuery, title: str) -> bool:
         """超宽松匹配：处理符号变体和部分匹配"""
-        query_lower = query.lower()
         title_lower = title.lower()
         
+        # 原始文本包含查询词时标准化后也必然包含，无需标准化
+        if pq.lower in title_lower:
+            return True
+        
+        # 与原始标题没有共同字符时标准化后也没有，同样无需标准化
+        if pq.quick_chars is not None and pq.quick_chars.isdisjoint(title_lower):
+            return False
+        
         # 标准化文本
-        normalized_query = self._normalize_text(query_lower)
-        normalized_title = self._normalize_text(title_lower)
+        normalized_title = _normalize_text(title_lower)
         
         # 检查标准化后的完整匹配
-        if normalized_query in normalized_title:
+        if pq.norm in normalized_title:
             return True
         
-        # 检查部分匹配（至少50%的查询词匹配）
-        query_chars = set(normalized_query.replace(' ', ''))
-        title_chars = set(normalized_title.replace(' ', ''))
-        if len(query_chars) > 0:
-            match_ratio = len(query_chars & title_chars) / len(query_chars)
-            if match_ratio >= 0.5:  # 至少50%的字符匹配
-                return True
-        
-        # 超宽松匹配：只要有一个字相同就不过滤（优先级低但不过滤）
-        if len(query_chars) > 0:
-            common_chars = query_chars & title_chars
-            if len(common_chars) > 0:  # 至少有一个字符相同
-                return True
-        
-        return False
+        # 超宽松匹配：只要有一个字相同就不过滤（优先级低但不过滤）；
+        # 50%字符匹配的情况已包含在内，不再单独计算匹配度。
+        # 查询字符集合不含空格，可以直接与标准化后的标题比较，找到一个共同字符即返回
+        return bool(pq.chars) and not pq.chars.isdisjoint(normalized_title)
 
     def _is_relevant_content(self, title: str, url: str, query: str) -> bool:
         """检查内容是否与网页搜索相关 - 使用分数计算"""
@@ -790,46 +1435,43 @@ class WebSearch(BaseSearch):
             return False
         
         # 使用分数计算来判断相关性
-        score = self._calculate_relevance_score(title, url, query)
+        score = self._calculate_relevance_score(title, url, _prepare_query(query))
         return score > 0
 
-    def _calculate_relevance_score(self, title: str, url: str, query: str) -> int:
-        """计算相关性分数（不过滤任何结果）"""
-        if not title or not query:
+    def _calculate_relevance_score(self, title: str, url: str, pq: PreparedQuery) -> int:
+        """计算相关性分数（不过滤任何结果）
+        
+        pq为_prepare_query预处理后的查询词，避免对每条结果重复处理查询
+        """
+        if not title or not pq.lower:
             return 1  # 给基础分数，不过滤
         
         title_lower = title.lower()
-        query_lower = query.lower()
-        
-        # 标准化文本
-        normalized_query = self._normalize_text(query_lower)
-        normalized_title = self._normalize_text(title_lower)
-        
-        # 检查匹配数量
-        query_chars = set(normalized_query.replace(' ', ''))
-        title_chars = set(normalized_title.replace(' ', ''))
-        match_count = len(query_chars & title_chars)
         
         # 基础分数，确保所有结果都有分数
         score = 1
         
-        # 如果有匹配字符，给额外分数
-        if match_count > 0:
-            score += match_count * 50  # 每个匹配字符给50分
-        
-        # 完整匹配给高分
-        if normalized_query in normalized_title:
-            score += 1000
+        # 快速排除：标题与查询没有任何共同字符时，不可能有字符匹配或完整匹配，跳过标准化
+        if pq.quick_chars is None or not pq.quick_chars.isdisjoint(title_lower):
+            # 标准化文本
+            normalized_title = _normalize_text(title_lower)
+            
+            # 检查匹配数量
+            title_chars = set(normalized_title.replace(' ', ''))
+            match_count = len(pq.chars & title_chars)
+            
+            # 如果有匹配字符，给额外分数
+            if match_count > 0:
+                score += match_count * 50  # 每个匹配字符给50分
+            
+            # 完整匹配给高分
+            if pq.norm in normalized_title:
+                score += 1000
         
         # 概念性、官网类内容加分
-        official_keywords = [
-            '官网', '官方网站', 'official', 'homepage', 'home page',
-            '概念', '介绍', 'introduction', 'about', '什么是', 'what is',
-            '定义', 'definition', '百科', 'wiki', '萌娘百科', '萌娘百科'
-        ]
-
-        for keyword in official_keywords:
-            if keyword in title_lower or keyword in url.lower():
+        url_lower = url.lower()
+        for keyword in self.OFFICIAL_KEYWORDS:
+            if keyword in title_lower or keyword in url_lower:
                 score += 20  # 概念性、官网类内容额外加分
                 break
         
@@ -838,19 +1480,13 @@ class WebSearch(BaseSearch):
     def _parse_search_results(self, soup: BeautifulSoup, query: str, engine: str = "bing") -> List[Dict[str, Any]]:
         """解析搜索结果页面"""
         results = []
+        pq = _prepare_query(query)
         
-        # 多种选择器尝试
-        selectors = [
-            'li.b_algo', 'li[class*="b_algo"]', '.b_algo', 
-            'li[class*="algo"]', 'li[class*="result"]', 
-            'div[class*="result"]', 'article', 'h2 a'
-        ]
-        
+        # 多种选择器尝试（合并为一次DOM遍历，按优先级取第一个有结果的选择器）
         found_results = False
-        for selector in selectors:
-            items = soup.select(selector)
+        for selector, items in _select_result_groups(soup):
             if items:
-                print(f"[DEBUG] 使用选择器 {selector} 找到 {len(items)} 个结果")
+                logger.debug("使用选择器 %s 找到 %s 个结果", selector, len(items))
                 found_results = True
                 
                 for item in items:
@@ -860,9 +1496,9 @@ class WebSearch(BaseSearch):
                         href = self._normalize_url(original_href)
                         if not href or self._is_bing_internal(href) or self._is_blacklisted(href):
                             if original_href in ['#', 'javascript:void(0);', 'javascript:void(0)']:
-                                print(f"[DEBUG] 过滤无效链接: {original_href}")
+                                logger.debug("过滤无效链接: %s", original_href)
                             elif self._is_blacklisted(href):
-                                print(f"[DEBUG] 过滤黑名单链接: {href}")
+                                logger.debug("过滤黑名单链接: %s", href)
                             continue
                         
                         title_elem = item.find('h2') or item.find('h3')
@@ -875,7 +1511,7 @@ class WebSearch(BaseSearch):
                         
                         if title:
                             # 计算相关性分数
-                            score = self._calculate_relevance_score(title, href, query)
+                            score = self._calculate_relevance_score(title, href, pq)
                             results.append({
                                 "title": title,
                                 "url": href,
@@ -883,19 +1519,19 @@ class WebSearch(BaseSearch):
                                 "engine": engine,
                                 "score": score
                             })
-                            print(f"[DEBUG] 找到{engine}结果: {title} - {href} (分数: {score})")
+                            logger.debug("找到%s结果: %s - %s (分数: %s)", engine, title, href, score)
                 break
         
         # 如果没找到结构化结果，尝试所有链接
         if not found_results:
-            print(f"[DEBUG] 未找到结构化结果，尝试所有链接")
+            logger.debug("未找到结构化结果，尝试所有链接")
             all_links = soup.find_all('a', href=True)
             for link in all_links:
                 original_href = link.get('href', '')
                 href = self._normalize_url(original_href)
                 if not href or self._is_bing_internal(href) or self._is_blacklisted(href):
                     if original_href in ['#', 'javascript:void(0);', 'javascript:void(0)']:
-                        print(f"[DEBUG] 过滤无效链接: {original_href}")
+                        logger.debug("过滤无效链接: %s", original_href)
                     continue
                 
                 title = link.get_text().strip()
@@ -903,7 +1539,7 @@ class WebSearch(BaseSearch):
                 
                 if title:
                     # 计算相关性分数
-                    score = self._calculate_relevance_score(title, href, query)
+                    score = self._calculate_relevance_score(title, href, pq)
                     results.append({
                         "title": title,
                         "url": href,
@@ -911,27 +1547,119 @@ class WebSearch(BaseSearch):
                         "engine": engine,
                         "score": score
                     })
-                    print(f"[DEBUG] 找到{engine}链接结果: {title} - {href} (分数: {score})")
+                    logger.debug("找到%s链接结果: %s - %s (分数: %s)", engine, title, href, score)
         
         return results
 
     def _search_bing(self, query: str, page: int = 0, use_selenium: bool = False) -> List[Dict[str, Any]]:
         """使用Bing搜索"""
         s = self._session()
-        count = self.config.get("settings", {}).get("engine_max_results", 35)
+        count = self.engine_max_results
         first = max(0, int(page)) * count + 1
         
-        url = f"https://www.bing.com/search?q={query}&setlang=zh-cn&count={count}&first={first}"
+        url = f"https://www.bing.com/search?q={quote_plus(query)}&setlang=zh-cn&count={count}&first={first}"
         
         r = self._request(s, url, use_selenium=use_selenium)
         if not r:
             return []
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        if self.fast_parse:
+            results = self._parse_search_results_fast(r.content, query, "bing")
+            if results:
+                return results
+        
+        if SELECTOLAX_AVAILABLE:
+            results = self._parse_with_selectolax(r.content, query, "bing")
+            if results:
+                return results
+        
+        soup = _bing_soup(r.content)
         return self._parse_search_results(soup, query, "bing")
 
+    def _parse_search_results_fast(self, content: bytes, query: str, engine: str = "bing") -> List[Dict[str, Any]]:
+        """用正则直接提取Bing结果链接，跳过DOM构建
+        
+        没有匹配时返回空列表，由调用方回退到DOM解析
+        """
+        results = []
+        pq = _prepare_query(query)
+        for match in _BING_RESULT_RE.finditer(content):
+            original_href = html.unescape(match.group(1).decode('utf-8', 'ignore'))
+            href = self._normalize_url(original_href)
+            if not href or self._is_bing_internal(href) or self._is_blacklisted(href):
+                continue
+            
+            title = _STRIP_TAGS_RE.sub(b'', match.group(2)).decode('utf-8', 'ignore')
+            title = self._clean_title(html.unescape(title).strip(), href, "")
+            
+            if title:
+                score = self._calculate_relevance_score(title, href, pq)
+                results.append({
+                    "title": title,
+                    "url": href,
+                    "snippet": "",
+                    "engine": engine,
+                    "score": score
+                })
+        
+        logger.debug("正则快速解析找到 %s 个结果", len(results))
+        return results
+
+    def _parse_with_selectolax(self, html: bytes, query: str, engine: str = "bing") -> List[Dict[str, Any]]:
+        """使用selectolax解析搜索结果页面（与_parse_search_results的结构化解析一致）
+        
+        没有找到结构化结果时返回空列表，由调用方回退到BeautifulSoup解析
+        """
+        results = []
+        pq = _prepare_query(query)
+        tree = LexborHTMLParser(html)
+        
+        for selector in _RESULT_SELECTORS:
+            items = tree.css(selector)
+            if not items:
+                continue
+            logger.debug("selectolax使用选择器 %s 找到 %s 个结果", selector, len(items))
+            
+            for item in items:
+                link_elem = item.css_first('a[href]')
+                if link_elem is None:
+                    continue
+                original_href = link_elem.attributes.get('href') or ''
+                href = self._normalize_url(original_href)
+                if not href or self._is_bing_internal(href) or self._is_blacklisted(href):
+                    continue
+                
+                title_elem = item.css_first('h2') or item.css_first('h3')
+                if title_elem is not None:
+                    title = title_elem.text().strip()
+                else:
+                    title = link_elem.text().strip()
+                
+                title = self._clean_title(title, href, "")
+                
+                if title:
+                    # 计算相关性分数
+                    score = self._calculate_relevance_score(title, href, pq)
+                    results.append({
+                        "title": title,
+                        "url": href,
+                        "snippet": "",
+                        "engine": engine,
+                        "score": score
+                    })
+            break
+        
+        return results
+
     def _get_sites_by_type(self, stype: str) -> List[Dict[str, Any]]:
-        """获取指定类型的网站列表"""
+        """获取指定类型的网站列表（使用缓存的搜索计划）"""
+        sites = self._site_plans.get(stype)
+        if sites is None:
+            sites = self._site_plans[stype] = self._build_sites_by_type(stype)
+        return sites
+
+    def _build_sites_by_type(self, stype: str) -> List[Dict[str, Any]]:
+        """遍历配置生成指定类型的网站列表"""
         sites = []
         
         if stype == 'web':
@@ -942,7 +1670,7 @@ class WebSearch(BaseSearch):
                         # 检查单个域名的禁用状态
                         domain_status = config.get("domain_status", {})
                         if domain in domain_status and not domain_status[domain]:
-                            print(f"[DEBUG] 跳过禁用的网页网站: {domain}")
+                            logger.debug("跳过禁用的网页网站: %s", domain)
                             continue
                         
                         sites.append({
@@ -958,65 +1686,108 @@ class WebSearch(BaseSearch):
         results = []
         s = self._session()
         start_time = time.time()
+        quoted_query = quote(query)  # 查询词可能出现在路径或参数中，统一百分号编码
         
         for search_url in search_urls:
             # 检查单个网站的超时
             if time.time() - start_time > timeout:
-                print(f"[DEBUG] {domain} 搜索超时({timeout}秒)，已搜索 {len(results)} 条结果")
+                logger.debug("%s 搜索超时(%s秒)，已搜索 %s 条结果", domain, timeout, len(results))
                 break
                 
             try:
                 # 替换查询参数
-                url = search_url.replace('{query}', query)
-                print(f"[DEBUG] 直接访问网页网站: {url}")
+                url = search_url.replace('{query}', quoted_query)
+                logger.debug("直接访问网页网站: %s", url)
                 
                 r = self._request(s, url)
                 if not r:
                     continue
                 
-                soup = BeautifulSoup(r.content, 'html.parser')
-                site_results = self._parse_web_site_results(soup, query, domain)
+                if LXML_AVAILABLE:
+                    site_results = self._parse_web_site_results_lxml(_lxml_document(r.content), query, domain)
+                else:
+                    soup = BeautifulSoup(r.content, _PARSER)
+                    site_results = self._parse_web_site_results(soup, query, domain)
                 results.extend(site_results)
-                print(f"[DEBUG] {domain} 直接访问返回: {len(site_results)} 条结果")
+                logger.debug("%s 直接访问返回: %s 条结果", domain, len(site_results))
                 
             except Exception as e:
-                print(f"[DEBUG] {domain} 直接访问失败: {e}")
+                logger.debug("%s 直接访问失败: %s", domain, e)
+                continue
+        
+        return results
+
+    def _parse_web_site_results_lxml(self, doc, query: str, domain: str) -> List[Dict[str, Any]]:
+        """在lxml文档树上解析网页网站搜索结果（与_parse_web_site_results的规则一致）"""
+        results = []
+        pq = _prepare_query(query)
+        base_url = f"https://{domain}"
+        
+        for item in doc.iterfind('.//a[@href]'):
+            href = item.get('href')
+            
+            # 只保留http(s)和站内相对链接
+            if not href.startswith(('http', '/')):
+                continue
+            
+            title = ''.join(text.strip() for text in _LINK_TEXT_XPATH(item))
+            if not title:
+                continue
+            
+            # 处理相对URL
+            if href[0] == '/':
+                href = base_url + href
+            
+            # 过滤掉与查询无关的链接，分数保存到结果中
+            score = self._calculate_relevance_score(title, href, pq)
+            if score <= 0:
                 continue
+            
+            results.append({
+                "title": title,
+                "url": href,
+                "snippet": title,
+                "source": domain,
+                "score": score
+            })
         
         return results
 
     def _parse_web_site_results(self, soup: BeautifulSoup, query: str, domain: str) -> List[Dict[str, Any]]:
         """解析网页网站搜索结果页面"""
         results = []
+        pq = _prepare_query(query)
+        
+        base_url = f"https://{domain}"
         
         # 通用解析策略：查找所有链接
-        items = soup.select('a[href]')
-        for item in items:
+        for item in soup.find_all('a', href=True):
             href = item.get('href', '')
-            title = item.get_text(strip=True)
             
-            if not href or not title:
+            # 只保留http(s)和站内相对链接：空链接、#、javascript:、mailto:等在提取文本前就跳过
+            # （补全后的链接都以http开头，不会再命中_is_invalid_link的无效前缀）
+            if not href.startswith(('http', '/')):
                 continue
             
-            # 处理相对URL
-            if href.startswith('/'):
-                href = f"https://{domain}{href}"
-            elif not href.startswith('http'):
+            title = item.get_text(strip=True)
+            if not title:
                 continue
             
-            # 过滤掉无效链接
-            if self._is_invalid_link(href):
-                continue
+            # 处理相对URL
+            if href[0] == '/':
+                href = base_url + href
             
-            # 过滤掉与查询无关的链接
-            if not self._is_relevant_content(title, href, query):
+            # 过滤掉与查询无关的链接（与_is_relevant_content相同，分数顺便保存到结果中）
+            score = self._calculate_relevance_score(title, href, pq)
+            if score <= 0:
                 continue
             
             results.append({
                 "title": title,
                 "url": href,
                 "snippet": title,
-                "source": domain
+                "source": domain,
+                "score": score
             })
         
         return results
@@ -1026,7 +1797,7 @@ class WebSearch(BaseSearch):
         s = self._session()
         pn = max(0, int(page)) * 10
         
-        url = f"https://www.baidu.com/s?wd={query}&pn={pn}"
+        url = f"https://www.baidu.com/s?wd={quote_plus(query)}&pn={pn}"
         
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -1042,12 +1813,18 @@ class WebSearch(BaseSearch):
             "Referer": "https://www.baidu.com/"
         }
         
-        print(f"[DEBUG] 百度搜索: {query} (第{page+1}页)")
+        logger.debug("百度搜索: %s (第%s页)", query, page + 1)
         r = self._request(s, url, headers=headers)
         if not r:
             return []
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        # 优先在C层解析（不创建BeautifulSoup对象），没有结构化结果时再回退到BeautifulSoup
+        if SELECTOLAX_AVAILABLE:
+            results = self._parse_with_selectolax(r.content, query, "baidu")
+            if results:
+                return results
+        
+        soup = BeautifulSoup(r.content, _PARSER)
         return self._parse_search_results(soup, query, "baidu")
 
     def _search_sogou(self, query: str, page: int = 0) -> List[Dict[str, Any]]:
@@ -1055,7 +1832,7 @@ class WebSearch(BaseSearch):
         s = self._session()
         p = max(0, int(page)) + 1
         
-        url = f"https://sogou.com/web?query={query}&_asf=www.sogou.com&_ast=&w=01019900&p={p}&ie=utf8&from=index-nologin&s_from=index&sourceid=9_01_03"
+        url = f"https://sogou.com/web?query={quote_plus(query)}&_asf=www.sogou.com&_ast=&w=01019900&p={p}&ie=utf8&from=index-nologin&s_from=index&sourceid=9_01_03"
         
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -1071,12 +1848,18 @@ class WebSearch(BaseSearch):
             "Referer": "https://www.sogou.com/"
         }
         
-        print(f"[DEBUG] 搜狗搜索: {query} (第{page+1}页)")
+        logger.debug("搜狗搜索: %s (第%s页)", query, page + 1)
         r = self._request(s, url, headers=headers)
         if not r:
             return []
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        # 优先在C层解析（不创建BeautifulSoup对象），没有结构化结果时再回退到BeautifulSoup
+        if SELECTOLAX_AVAILABLE:
+            results = self._parse_with_selectolax(r.content, query, "sogou")
+            if results:
+                return results
+        
+        soup = BeautifulSoup(r.content, _PARSER)
         return self._parse_search_results(soup, query, "sogou")
 
 
@@ -1092,35 +1875,49 @@ class WebSearch(BaseSearch):
             搜索结果列表
         """
         all_results = []
-        seen = set()  # 用于去重
+        seen = set()  # 用于去重（按规范化URL键，忽略锚点、参数顺序和跟踪参数）
         
-        for page in range(max_pages):
-            print(f"[DEBUG] 搜索第 {page + 1} 页")
-            
-            # 使用Bing进行多页搜索
-            page_results = self._search_bing(query, page, use_selenium)
-            
-            if not page_results:
-                print(f"[DEBUG] 第 {page + 1} 页无结果，停止搜索")
-                break
-            
-            new_count = 0
-            for result in page_results:
-                url = result.get("url", "")
-                if url and url not in seen:
-                    seen.add(url)
-                    all_results.append(result)
-                    new_count += 1
-                    print(f"[DEBUG] 新增结果: {result.get('title', '')} - {url}")
-            
-            print(f"[DEBUG] 第 {page + 1} 页新增 {new_count} 条结果")
-            
-            # 如果没有新结果，停止搜索
-            if new_count == 0:
-                print(f"[DEBUG] 第 {page + 1} 页无新结果，停止搜索")
-                break
+        # 各页互不依赖，同时请求；合并时仍按页码顺序并使用原来的停止条件
+        page_futures = [
+            self._page_executor.submit(self._search_bing, query, page, use_selenium)
+            for page in range(max_pages)
+        ]
+        
+        try:
+            for page, future in enumerate(page_futures):
+                logger.debug("搜索第 %s 页", page + 1)
+                
+                # 使用Bing进行多页搜索
+                page_results = future.result()
+                
+                if not page_results:
+                    logger.debug("第 %s 页无结果，停止搜索", page + 1)
+                    break
+                
+                new_count = 0
+                for result in page_results:
+                    url = result.get("url", "")
+                    if not url:
+                        continue
+                    key = self._url_key(url) or url
+                    if key not in seen:
+                        seen.add(key)
+                        all_results.append(result)
+                        new_count += 1
+                        logger.debug("新增结果: %s - %s", result.get('title', ''), url)
+                
+                logger.debug("第 %s 页新增 %s 条结果", page + 1, new_count)
+                
+                # 如果没有新结果，停止搜索
+                if new_count == 0:
+                    logger.debug("第 %s 页无新结果，停止搜索", page + 1)
+                    break
+        finally:
+            # 提前停止时取消尚未开始的后续页请求（已在执行的请求无法中断），不额外请求Bing
+            for future in page_futures:
+                future.cancel()
         
-        print(f"[DEBUG] 多页搜索完成，共获得 {len(all_results)} 条结果")
+        logger.debug("多页搜索完成，共获得 %s 条结果", len(all_results))
         return all_results
 
     def _search_site_concurrent(self, site_info: Dict[str, Any], query: str, page: int = 0, timeout: int = None) -> List[Dict[str, Any]]:
@@ -1137,10 +1934,10 @@ class WebSearch(BaseSearch):
         domain = site_info["domain"]
         search_urls = site_info.get("search_urls", [])
         
-        print(f"[DEBUG] 并发搜索网站: {domain}")
+        logger.debug("并发搜索网站: %s", domain)
         
         if not search_urls:
-            print(f"[DEBUG] {domain} 没有配置搜索URL，跳过")
+            logger.debug("%s 没有配置搜索URL，跳过", domain)
             return []
         
         # 为搜索引擎使用专门的解析方法
@@ -1156,18 +1953,9 @@ class WebSearch(BaseSearch):
             timeout_value = timeout if timeout is not None else self.request_timeout
             direct_results = self._search_web_site(domain, query, search_urls, timeout=timeout_value)
         
-        # 对直接访问结果进行分数计算（不过滤任何结果）
-        scored_results = []
-        for result in direct_results:
-            title = result.get("title", "")
-            url = result.get("url", "")
-            score = self._calculate_relevance_score(title, url, query)
-            result["score"] = score
-            scored_results.append(result)
-            print(f"[DEBUG] {domain}结果: {title} - {url} (分数: {score})")
-        
-        print(f"[DEBUG] {domain} 并发搜索返回: {len(direct_results)} 条，全部保留: {len(scored_results)} 条")
-        return scored_results
+        # 各解析函数在生成结果时已计算好分数，这里不再重复计算
+        logger.debug("%s 并发搜索返回: %s 条", domain, len(direct_results))
+        return direct_results
 
     def search(self, query: str, page: int = 0, limit: Optional[int] = None, filter_mode: str = 'loose') -> List[Dict[str, Any]]:
         """网页搜索主函数"""
@@ -1179,61 +1967,49 @@ class WebSearch(BaseSearch):
         try:
             # 1. 并发搜索配置的搜索引擎网站
             sites = self._get_sites_by_type('web')
-            timeout_per_site = self.config.get("settings", {}).get("site_timeout", 8)  # 每个网站的超时时间
-            
-            print(f"[DEBUG] 开始并发搜索 {len(sites)} 个网站")
-            
-            # 使用线程池进行并发搜索
-            with ThreadPoolExecutor(max_workers=min(len(sites), 4)) as executor:
-                # 提交所有搜索任务
-                future_to_site = {
-                    executor.submit(self._search_site_concurrent, site_info, query, page, timeout_per_site): site_info 
-                    for site_info in sites
-                }
-                
-                # 收集结果
-                for future in as_completed(future_to_site):
-                    site_info = future_to_site[future]
-                    try:
-                        site_results = future.result(timeout=timeout_per_site)
-                        results.extend(site_results)
-                        print(f"[DEBUG] {site_info['domain']} 并发搜索完成: {len(site_results)} 条结果")
-                    except Exception as e:
-                        print(f"[DEBUG] {site_info['domain']} 并发搜索失败: {e}")
-                        continue
+            timeout_per_site = self.site_timeout  # 每个网站的超时时间
+            
+            logger.debug("开始并发搜索 %s 个网站", len(sites))
+            
+            # 使用共享线程池进行并发搜索，所有网站同时发出请求
+            future_to_site = {
+                self._executor.submit(self._search_site_concurrent, site_info, query, page, timeout_per_site): site_info 
+                for site_info in sites
+            }
+            
+            # 收集结果
+            for future in as_completed(future_to_site):
+                site_info = future_to_site[future]
+                try:
+                    site_results = future.result()
+                    results.extend(site_results)
+                    logger.debug("%s 并发搜索完成: %s 条结果", site_info['domain'], len(site_results))
+                except Exception as e:
+                    logger.debug("%s 并发搜索失败: %s", site_info['domain'], e)
+                    continue
             
             # 2. 如果国内搜索引擎没有结果，使用Bing作为备用
             if not results:
-                print(f"[DEBUG] 国内搜索引擎无结果，使用Bing作为备用")
+                logger.debug("国内搜索引擎无结果，使用Bing作为备用")
                 bing_results = self._search_multiple_pages(query, max_pages=3, use_selenium=False)
                 
-                # 对Bing结果进行分数计算（不过滤任何结果）
-                scored_bing_results = []
-                for result in bing_results:
-                    title = result.get("title", "")
-                    url = result.get("url", "")
-                    score = self._calculate_relevance_score(title, url, query)
-                    result["score"] = score
-                    scored_bing_results.append(result)
-                    print(f"[DEBUG] Bing结果: {title} - {url} (分数: {score})")
-                
-                results.extend(scored_bing_results)
-                print(f"[DEBUG] Bing备用搜索: {len(bing_results)} 条，全部保留: {len(scored_bing_results)} 条")
+                # Bing解析时已计算分数（不过滤任何结果）
+                results.extend(bing_results)
+                logger.debug("Bing备用搜索: %s 条", len(bing_results))
             
-            print(f"[DEBUG] 网页搜索完成，共搜索了 {len(sites)} 个网站（每个网站超时{timeout_per_site}秒），获得 {len(results)} 条原始结果")
+            logger.debug("网页搜索完成，共搜索了 %s 个网站（每个网站超时%s秒），获得 %s 条原始结果", len(sites), timeout_per_site, len(results))
             
             # 智能去重
             dedup = self._smart_deduplication(results)
             
-            # 按分数排序（分数高的在前）
-            dedup.sort(key=lambda x: x.get("score", 0), reverse=True)
+            # 按分数排序（分数高的在前，所有结果都带有score）
+            dedup.sort(key=itemgetter("score"), reverse=True)
             
-            print(f"[DEBUG] 网页搜索总计: {len(results)} 条结果，去重后: {len(dedup)} 条")
+            logger.debug("网页搜索总计: %s 条结果，去重后: %s 条", len(results), len(dedup))
             return dedup
             
         except Exception as e:
-            print(f"[DEBUG] 网页搜索异常: {e}")
-            traceback.print_exc()
+            logger.exception("网页搜索异常: %s", e)
             return []
     
     def get_all_sites(self) -> Dict[str, Any]:
@@ -1251,7 +2027,7 @@ class WebSearch(BaseSearch):
             domains = custom_config.get("domains", [])
             
             # 检查域名是否已存在
-            if domain in domains:
+            if self._has_site_domain("web_sites", "custom", domain):
                 # 更新搜索URL
                 if search_urls:
                     search_urls_dict = custom_config.get("search_urls", {})
@@ -1284,32 +2060,26 @@ class WebSearch(BaseSearch):
                 return {'success': True, 'action': 'added', 'message': f'网页搜索网站 {domain} 添加成功'}
                 
         except Exception as e:
-            print(f"[DEBUG] 添加网页搜索网站失败: {e}")
+            logger.debug("添加网页搜索网站失败: %s", e)
             return {'success': False, 'message': f'添加失败: {str(e)}'}
     
     def remove_site(self, domain: str, site_type: str) -> None:
         """删除网站"""
         try:
             # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
+            key = self.SITE_TYPE_KEYS.get(site_type)
+            if not key:
                 return
+            sites_config = self.config.get(key, {})
             
             # 从所有分类中删除指定域名
             for category, config in sites_config.items():
                 # 从域名列表中删除
                 domains = config.get("domains", [])
-                if domain in domains:
+                if self._has_site_domain(key, category, domain):
                     domains.remove(domain)
                     config["domains"] = domains
-                    print(f"[DEBUG] 从分类 {category} 中删除域名: {domain}")
+                    logger.debug("从分类 %s 中删除域名: %s", category, domain)
                 
                 # 从搜索URL中删除
                 search_urls = config.get("search_urls", {})
@@ -1324,40 +2094,30 @@ class WebSearch(BaseSearch):
                     config["domain_status"] = domain_status
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 删除网站: {domain} ({site_type})")
+            self._schedule_save()
+            logger.debug("删除网站: %s (%s)", domain, site_type)
         except Exception as e:
-            print(f"[DEBUG] 删除网站失败: {e}")
+            logger.debug("删除网站失败: %s", e)
     
     def add_to_blacklist(self, domain: str) -> None:
         """添加到黑名单"""
         if "blacklist" not in self.config:
             self.config["blacklist"] = {"domains": [], "enabled": True}
         
-        if domain not in self.config["blacklist"]["domains"]:
+        if domain not in self._blacklist_domains:
             self.config["blacklist"]["domains"].append(domain)
             self._save_config()
     
     def remove_from_blacklist(self, domain: str) -> None:
         """从黑名单移除"""
-        if "blacklist" in self.config and domain in self.config["blacklist"]["domains"]:
+        if "blacklist" in self.config and domain in self._blacklist_domains:
             self.config["blacklist"]["domains"].remove(domain)
             self._save_config()
     
-    def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
-        """切换网站启用状态"""
+    def toggle(self, domain: str, enabled: bool) -> None:
+        """切换本类型网站的启用状态（网站类型已由调用方分派）"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新域名状态
             for category, config in sites_config.items():
@@ -1368,25 +2128,15 @@ class WebSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 切换网站状态: {domain} -> {'启用' if enabled else '禁用'}")
+            self._schedule_save()
+            logger.debug("切换网站状态: %s -> %s", domain, '启用' if enabled else '禁用')
         except Exception as e:
-            print(f"[DEBUG] 切换网站状态失败: {e}")
+            logger.debug("切换网站状态失败: %s", e)
     
-    def get_site_search_urls(self, site_type: str, domain: str) -> list:
-        """获取指定网站的搜索URL"""
+    def get_search_urls(self, domain: str) -> list:
+        """获取本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return []
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 查找指定域名的搜索URL
             for category, config in sites_config.items():
@@ -1397,23 +2147,13 @@ class WebSearch(BaseSearch):
             
             return []
         except Exception as e:
-            print(f"[DEBUG] 获取搜索URL失败: {e}")
+            logger.debug("获取搜索URL失败: %s", e)
             return []
     
-    def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
-        """更新指定网站的搜索URL"""
+    def update_search_urls(self, domain: str, search_urls: list) -> None:
+        """更新本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新指定域名的搜索URL
             for category, config in sites_config.items():
@@ -1424,22 +2164,38 @@ class WebSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 更新 {domain} 的搜索URL: {search_urls}")
+            self._schedule_save()
+            logger.debug("更新 %s 的搜索URL: %s", domain, search_urls)
         except Exception as e:
-            print(f"[DEBUG] 更新搜索URL失败: {e}")
+            logger.debug("更新搜索URL失败: %s", e)
 
 
 class ImageSearch(BaseSearch):
     """图片搜索类"""
     
-    # 图片属性列表
-    IMAGE_ATTRIBUTES = [
+    # 本类管理的配置中的网站列表键
+    SITE_KEY = "image_sites"
+    
+    # 图片属性列表（按优先级排列）
+    IMAGE_ATTRIBUTES = (
         'data-src', 'data-m', 'data-href', 'data-imgurl', 'data-bm', 
         'data-original', 'data-hires', 'data-full', 'data-large', 'data-hd', 'src',
         'data-msrc', 'data-big', 'data-super', 'data-zoom', 'data-thumb',
         'data-preview', 'data-image', 'data-img', 'data-pic', 'data-photo'
-    ]
+    )
+    # 属性名 -> 优先级，用于只遍历元素实际拥有的属性
+    IMAGE_ATTRIBUTE_RANK = {attr: i for i, attr in enumerate(IMAGE_ATTRIBUTES)}
+    
+    # 直接访问图片网站时的Accept请求头
+    DIRECT_SITE_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+    
+    # 直接指向图片文件的链接后缀
+    IMAGE_LINK_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp')
+    
+    # URL中包含图片扩展名（不区分大小写的子串匹配，只折叠ASCII大小写，与先lower()再查找一致）
+    _IMG_CONTENT_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp|bmp|svg|ico)', re.I | re.A)
+    # 网站页面中指向图片文件的链接
+    _IMG_LINK_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp)', re.I | re.A)
     
     def __init__(self, config_file: str = "sites_config.json"):
         super().__init__(config_file)
@@ -1458,26 +2214,16 @@ class ImageSearch(BaseSearch):
         if not url or not title:
             return False
         
-        # 检查标题是否包含中文字符
-        def has_chinese(text):
-            for char in text:
-                if '\u4e00' <= char <= '\u9fff':
-                    return True
-            return False
-        
         # 如果标题包含中文，很可能是无效的图片链接
-        if has_chinese(title):
-            print(f"[DEBUG] 过滤中文标题: {title}")
+        if _RE_CJK.search(title):
+            logger.debug("过滤中文标题: %s", title)
             return False
         
-        url_lower = url.lower()
-        
         # 检查是否是图片文件扩展名
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg', '.ico']
-        for ext in image_extensions:
-            if ext in url_lower:
-                print(f"[DEBUG] 找到图片文件扩展名: {ext} in {url}")
-                return True
+        match = self._IMG_CONTENT_EXT_RE.search(url)
+        if match:
+            logger.debug("找到图片文件扩展名: %s in %s", match.group().lower(), url)
+            return True
         
         return False
     
@@ -1494,96 +2240,112 @@ class ImageSearch(BaseSearch):
             return False
         
         # 检查URL中是否包含尺寸参数，过滤太小的图片
-        import re
-        
-        # 检查常见的尺寸参数模式
-        size_patterns = [
-            r'w=(\d+)',  # width参数
-            r'width=(\d+)',  # width参数
-            r'h=(\d+)',  # height参数
-            r'height=(\d+)',  # height参数
-            r'size=(\d+)',  # size参数
-            r'dim=(\d+)',  # dimension参数
-        ]
-        
-        for pattern in size_patterns:
-            matches = re.findall(pattern, image_url)
+        for pattern in _RE_SIZE_PARAMS:
+            matches = pattern.findall(image_url)
             for match in matches:
                 size = int(match)
                 if size < 50:  # 过滤小于50像素的图片
-                    print(f"[DEBUG] 过滤小图片: {size}px in {image_url}")
+                    logger.debug("过滤小图片: %spx in %s", size, image_url)
                     return False
         
-        # 检查URL中是否包含小图片的标识
-        small_image_indicators = [
-            'w=12', 'h=12', 'w=16', 'h=16', 'w=24', 'h=24', 'w=32', 'h=32',
-            'size=12', 'size=16', 'size=24', 'size=32', 'size=48',
-            'thumb', 'thumbnail', 'icon', 'favicon', 'logo'
-        ]
-        
-        for indicator in small_image_indicators:
-            if indicator in image_url.lower():
-                print(f"[DEBUG] 过滤小图片标识: {indicator} in {image_url}")
-                return False
+        # 检查URL中是否包含小图片的标识（一次正则扫描代替逐个子串判断）
+        m = _RE_SMALL_IMAGE.search(image_url.lower())
+        if m:
+            logger.debug("过滤小图片标识: %s in %s", m.group(0), image_url)
+            return False
         
         return True
     
+    def _image_attr(self, element) -> Tuple[Optional[str], Optional[str]]:
+        """查找元素上优先级最高的http图片属性
+        
+        只遍历元素实际拥有的属性（通常只有几个），而不是逐个探测IMAGE_ATTRIBUTES
+        
+        Returns:
+            (属性名, 图片URL)，没有时为(None, None)
+        """
+        best_rank = len(self.IMAGE_ATTRIBUTES)
+        best = (None, None)
+        for attr, value in element.attrs.items():
+            rank = self.IMAGE_ATTRIBUTE_RANK.get(attr)
+            if rank is not None and rank < best_rank and isinstance(value, str) and value.startswith('http'):
+                best_rank = rank
+                best = (attr, value)
+        return best
+
     def _extract_image_url(self, link_element, href: str) -> Optional[str]:
         """从链接元素中提取图片URL"""
         try:
             # 1. 检查所有可能的图片属性
-            for attr in self.IMAGE_ATTRIBUTES:
-                img_url = link_element.get(attr)
-                if img_url and img_url.startswith('http'):
-                    print(f"[DEBUG] 找到图片URL ({attr}): {img_url}")
-                    return img_url
+            attr, img_url = self._image_attr(link_element)
+            if img_url:
+                logger.debug("找到图片URL (%s): %s", attr, img_url)
+                return img_url
             
             # 2. 检查img标签中的所有属性
             img_tag = link_element.find('img')
             if img_tag:
-                for attr in self.IMAGE_ATTRIBUTES:
-                    img_src = img_tag.get(attr)
-                    if img_src and img_src.startswith('http'):
-                        print(f"[DEBUG] 找到img图片URL ({attr}): {img_src}")
-                        return img_src
+                attr, img_src = self._image_attr(img_tag)
+                if img_src:
+                    logger.debug("找到img图片URL (%s): %s", attr, img_src)
+                    return img_src
             
             # 3. 检查直接图片链接
-            if href and any(href.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']):
-                print(f"[DEBUG] 找到直接图片链接: {href}")
+            if href and href.lower().endswith(self.IMAGE_LINK_EXTENSIONS):
+                logger.debug("找到直接图片链接: %s", href)
                 return href
                 
         except Exception as e:
-            print(f"[DEBUG] 提取图片URL失败: {e}")
+            logger.debug("提取图片URL失败: %s", e)
         
         return None
 
-    def _extract_image_from_parent(self, link_element) -> Optional[str]:
-        """从父元素中提取图片URL"""
+    def _extract_image_from_parent(self, link_element,
+                                   parent_cache: Optional[Dict[int, Optional[str]]] = None) -> Optional[str]:
+        """从父元素中提取图片URL
+        
+        Args:
+            link_element: 链接元素
+            parent_cache: 同一页面内共享的缓存（祖先节点id -> 从该节点向上查找的结果），
+                同一容器中的多个链接不再重复遍历相同的祖先节点
+        """
+        visited = []
+        result = None
         try:
             # 向上查找父元素中的图片
             current = link_element.parent
             while current and current.name != 'body':
+                if parent_cache is not None and id(current) in parent_cache:
+                    result = parent_cache[id(current)]
+                    break
+                visited.append(id(current))
+                
                 # 查找当前元素中的img标签
                 img_tag = current.find('img')
                 if img_tag:
-                    for attr in self.IMAGE_ATTRIBUTES:
-                        img_src = img_tag.get(attr)
-                        if img_src and img_src.startswith('http'):
-                            print(f"[DEBUG] 从父元素找到图片URL ({attr}): {img_src}")
-                            return img_src
+                    attr, img_src = self._image_attr(img_tag)
+                    if img_src:
+                        logger.debug("从父元素找到图片URL (%s): %s", attr, img_src)
+                        result = img_src
+                        break
                 
                 # 检查父元素的data属性
-                for attr in self.IMAGE_ATTRIBUTES:
-                    img_url = current.get(attr)
-                    if img_url and img_url.startswith('http'):
-                        print(f"[DEBUG] 从父元素属性找到图片URL ({attr}): {img_url}")
-                        return img_url
+                attr, img_url = self._image_attr(current)
+                if img_url:
+                    logger.debug("从父元素属性找到图片URL (%s): %s", attr, img_url)
+                    result = img_url
+                    break
                 
                 current = current.parent
         except Exception as e:
-            print(f"[DEBUG] 从父元素提取图片失败: {e}")
+            logger.debug("从父元素提取图片失败: %s", e)
+            return None
         
-        return None
+        # 途经的祖先节点向上查找的结果都相同
+        if parent_cache is not None:
+            for node_id in visited:
+                parent_cache[node_id] = result
+        return result
 
     def _parse_bing_images_simple(self, soup: BeautifulSoup, query: str) -> List[Dict[str, Any]]:
         """简化的Bing图片解析"""
@@ -1591,41 +2353,27 @@ class ImageSearch(BaseSearch):
         
         # 查找真正的图源链接，过滤掉Bing内部链接
         all_links = soup.find_all('a', href=True)
+        parent_cache: Dict[int, Optional[str]] = {}  # 祖先节点向上查找图片的结果
         
         for link in all_links:
             try:
                 href = link.get('href', '')
-                title = link.get_text().strip()
-                
-                # 过滤明显无效的链接
-                if (not href or 
-                    href.startswith('javascript:') or 
-                    href.startswith('#') or
-                    href.startswith('mailto:') or
-                    len(title) < 2):
-                    continue
                 
-                # 过滤Bing内部链接
-                if (href.startswith('https://www.bing.com/') or 
-                    href.startswith('https://cn.bing.com/') or
-                    'bing.com' in href):
+                # 只处理外部链接（真正的图源）：空链接、javascript:、#、mailto:和相对路径都不以http开头；
+                # 再过滤Bing内部链接（包含www.bing.com、cn.bing.com等所有子域名）
+                if not href.startswith('http') or 'bing.com' in href:
                     continue
                 
-                # 只处理外部链接（真正的图源）
-                if not href.startswith('http'):
+                # 过滤标题过短的链接
+                title = link.get_text().strip()
+                if len(title) < 2:
                     continue
                 
-                # 处理相对路径，转换为完整URL
-                if href.startswith('/'):
-                    href = f"https://www.bing.com{href}"
-                elif not href.startswith('http'):
-                    href = f"https://www.bing.com/{href}"
-                
                 # 尝试从链接元素提取图片URL
                 image_url = self._extract_image_url(link, href)
                 if not image_url:
                     # 如果没找到，尝试从父元素提取
-                    image_url = self._extract_image_from_parent(link)
+                    image_url = self._extract_image_from_parent(link, parent_cache)
                 
                 # 使用找到的图片URL，如果没有则使用链接URL
                 final_url = image_url or href
@@ -1639,34 +2387,103 @@ class ImageSearch(BaseSearch):
                         "page": href,  # 图源链接
                         "engine": "bing"
                     })
-                    print(f"[DEBUG] 找到Bing图片: {title} - 图片:{image_url} 图源:{href}")
+                    logger.debug("找到Bing图片: %s - 图片:%s 图源:%s", title, image_url, href)
                 else:
                     if not image_url:
-                        print(f"[DEBUG] 过滤无图片URL: {title} - {href}")
+                        logger.debug("过滤无图片URL: %s - %s", title, href)
                     else:
-                        print(f"[DEBUG] 过滤无效图片: {title} - {image_url}")
+                        logger.debug("过滤无效图片: %s - %s", title, image_url)
 
                 
             except Exception as e:
-                print(f"[DEBUG] 解析Bing图片链接失败: {e}")
+                logger.debug("解析Bing图片链接失败: %s", e)
+                continue
+        
+        logger.debug("Bing图片解析完成: 找到 %s 条结果", len(results))
+        return results
+
+    def _lexbor_image_attr(self, node) -> Optional[str]:
+        """按IMAGE_ATTRIBUTES顺序查找selectolax节点上的第一个http图片地址"""
+        attrs = node.attrs
+        for attr in self.IMAGE_ATTRIBUTES:
+            value = attrs.get(attr)
+            if value and value.startswith('http'):
+                return value
+        return None
+
+    def _parse_bing_images_selectolax(self, content: bytes, query: str) -> List[Dict[str, Any]]:
+        """使用selectolax解析Bing图片页面（与_parse_bing_images_simple的规则一致）
+        
+        节点遍历和属性读取都在C层完成，避免BeautifulSoup为每个标签创建Python对象
+        """
+        results = []
+        tree = LexborHTMLParser(content)
+        parent_cache: Dict[int, Optional[str]] = {}  # 祖先节点(mem_id)向上查找图片的结果
+        
+        for link in tree.css('a[href]'):
+            href = link.attrs.get('href') or ''
+            title = link.text().strip()
+            
+            # 只处理外部链接，过滤Bing内部链接和标题过短的链接（与_parse_bing_images_simple一致）
+            if not href.startswith('http') or 'bing.com' in href or len(title) < 2:
                 continue
+            
+            # 1. 链接自身属性 2. 链接内的img标签 3. 直接图片链接
+            image_url = self._lexbor_image_attr(link)
+            if not image_url:
+                img_tag = link.css_first('img')
+                if img_tag is not None:
+                    image_url = self._lexbor_image_attr(img_tag)
+            if not image_url and href.lower().endswith(self.IMAGE_LINK_EXTENSIONS):
+                image_url = href
+            
+            # 4. 向上查找父元素中的图片（途经的祖先节点结果相同，缓存后同一容器中的链接不再重复查找）
+            current = link.parent
+            visited = []
+            while not image_url and current is not None and current.tag not in ('body', '-document'):
+                if current.mem_id in parent_cache:
+                    image_url = parent_cache[current.mem_id]
+                    break
+                visited.append(current.mem_id)
+                img_tag = current.css_first('img')
+                if img_tag is not None:
+                    image_url = self._lexbor_image_attr(img_tag)
+                if not image_url:
+                    image_url = self._lexbor_image_attr(current)
+                current = current.parent
+            for node_id in visited:
+                parent_cache[node_id] = image_url
+            
+            # 过滤太小的图片和无效图片URL
+            if image_url and self._is_valid_image(image_url):
+                results.append({
+                    "title": title or f"图片: {query}",
+                    "url": href,  # 图源链接（用于点击跳转）
+                    "snippet": image_url,  # 图片URL（用于显示）
+                    "page": href,  # 图源链接
+                    "engine": "bing"
+                })
+                logger.debug("找到Bing图片: %s - 图片:%s 图源:%s", title, image_url, href)
         
-        print(f"[DEBUG] Bing图片解析完成: 找到 {len(results)} 条结果")
+        logger.debug("Bing图片解析完成(selectolax): 找到 %s 条结果", len(results))
         return results
 
     def _search_bing(self, query: str, page: int = 0) -> List[Dict[str, Any]]:
         """使用Bing图片搜索"""
         s = self._session()
-        count = self.config.get("settings", {}).get("engine_max_results", 35)
+        count = self.engine_max_results
         first = max(0, int(page)) * count + 1
         
-        url = f"https://www.bing.com/images/search?q={query}&setlang=zh-cn&count={count}&first={first}"
+        url = f"https://www.bing.com/images/search?q={quote_plus(query)}&setlang=zh-cn&count={count}&first={first}"
         
         r = self._request(s, url)
         if not r:
             return []
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        if SELECTOLAX_AVAILABLE:
+            return self._parse_bing_images_selectolax(r.content, query)
+        
+        soup = BeautifulSoup(r.content, _PARSER)
         return self._parse_bing_images_simple(soup, query)
 
     def search(self, query: str, page: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -1674,60 +2491,69 @@ class ImageSearch(BaseSearch):
         if not query or len(query.strip()) < 1:
             return []
         
-        results = []
+        # 收集结果时直接按图片URL（snippet）去重，字典保持插入顺序且保留首次出现的结果
+        unique = {}
         
         try:
             # 1. 搜索配置的图片网站
             sites = self._get_sites_by_type('images')
-            print(f"[DEBUG] 找到 {len(sites)} 个图片网站: {[site['domain'] for site in sites]}")
-            timeout_per_site = self.config.get("settings", {}).get("site_timeout", 8)
+            logger.debug("找到 %s 个图片网站: %s", len(sites), [site['domain'] for site in sites])
+            timeout_per_site = self.site_timeout
             
-            for i, site_info in enumerate(sites, 1):
+            # 使用共享线程池并发访问所有图片网站，总耗时取决于最慢的网站
+            futures = []
+            for site_info in sites:
                 domain = site_info["domain"]
                 search_urls = site_info.get("search_urls", [])
-                
-                print(f"[DEBUG] 开始搜索图片网站 ({i}/{len(sites)}): {domain}")
-                
                 if search_urls:
                     # 有直接搜索URL的图片网站
-                    print(f"[DEBUG] {domain} 使用直接搜索URL: {search_urls}")
-                    direct_results = self._search_direct_site(domain, query, search_urls, timeout_per_site)
-                    results.extend(direct_results)
-                    print(f"[DEBUG] {domain} 直接访问返回: {len(direct_results)} 条结果")
+                    logger.debug("%s 使用直接搜索URL: %s", domain, search_urls)
                 else:
                     # 没有搜索URL，尝试直接访问首页
-                    print(f"[DEBUG] {domain} 没有搜索URL，尝试直接访问")
-                    direct_results = self._search_direct_site(domain, query, [f"https://{domain}/"], timeout_per_site)
-                    results.extend(direct_results)
-                    print(f"[DEBUG] {domain} 直接访问返回: {len(direct_results)} 条结果")
+                    logger.debug("%s 没有搜索URL，尝试直接访问", domain)
+                    search_urls = [f"https://{domain}/"]
+                futures.append((domain, self._executor.submit(
+                    self._search_direct_site, domain, query, search_urls, timeout_per_site,
+                    site_info.get("selector", ""), site_info.get("lexbor_ok", True))))
+            
+            # 按网站配置顺序收集结果，保证去重时的优先级不受完成顺序影响
+            for domain, future in futures:
+                try:
+                    direct_results = future.result()
+                    for item in direct_results:
+                        snippet = item.get("snippet")
+                        if snippet:
+                            unique.setdefault(snippet, item)
+                    logger.debug("%s 直接访问返回: %s 条结果", domain, len(direct_results))
+                except Exception as e:
+                    logger.debug("%s 图片搜索失败: %s", domain, e)
             
             # 2. 如果配置的网站没有结果，使用Bing作为备用
-            if not results:
-                print(f"[DEBUG] 配置的图片网站无结果，使用Bing搜索")
+            if not unique:
+                logger.debug("配置的图片网站无结果，使用Bing搜索")
                 bing_results = self._search_bing(query, page)
-                results.extend(bing_results)
-                print(f"[DEBUG] Bing图片搜索返回: {len(bing_results)} 条结果")
-            
-            # 去重（基于图片URL）
-            seen = set()
-            dedup = []
-            
-            for item in results:
-                snippet = item.get("snippet", "")
-                if snippet and snippet not in seen:
-                    seen.add(snippet)
-                    dedup.append(item)
+                for item in bing_results:
+                    snippet = item.get("snippet")
+                    if snippet:
+                        unique.setdefault(snippet, item)
+                logger.debug("Bing图片搜索返回: %s 条结果", len(bing_results))
             
-            print(f"[DEBUG] 图片搜索完成，共 {len(dedup)} 条结果")
-            return dedup
+            logger.debug("图片搜索完成，共 %s 条结果", len(unique))
+            return list(unique.values())
             
         except Exception as e:
-            print(f"[DEBUG] 图片搜索异常: {e}")
-            traceback.print_exc()
+            logger.exception("图片搜索异常: %s", e)
             return []
     
     def _get_sites_by_type(self, stype: str) -> List[Dict[str, Any]]:
-        """获取指定类型的网站列表"""
+        """获取指定类型的网站列表（使用缓存的搜索计划，配置保存后自动重建）"""
+        sites = self._site_plans.get(stype)
+        if sites is None:
+            sites = self._site_plans[stype] = self._build_sites_by_type(stype)
+        return sites
+
+    def _build_sites_by_type(self, stype: str) -> List[Dict[str, Any]]:
+        """根据当前配置生成指定类型的网站列表"""
         sites = []
         
         if stype == 'images':
@@ -1738,67 +2564,220 @@ class ImageSearch(BaseSearch):
                         # 检查单个域名的禁用状态
                         domain_status = config.get("domain_status", {})
                         if domain in domain_status and not domain_status[domain]:
-                            print(f"[DEBUG] 跳过禁用的图片网站: {domain}")
+                            logger.debug("跳过禁用的图片网站: %s", domain)
                             continue
                         
                         search_urls = config.get("search_urls", {}).get(domain, [])
+                        
+                        # 可选的专用CSS选择器（selectors: {域名: 选择器}），直接定位该网站的图片元素
+                        selector = config.get("selectors", {}).get(domain, "")
+                        lexbor_ok = True  # 选择器能否交给Lexbor执行，只在生成搜索计划时检查一次
+                        if selector:
+                            try:
+                                soupsieve.compile(selector)
+                            except Exception as e:
+                                logger.warning("图片网站 %s 的选择器无效，已忽略: %s", domain, e)
+                                selector = ""
+                            else:
+                                lexbor_ok = not SELECTOLAX_AVAILABLE or _lexbor_accepts(selector)
+                                if not lexbor_ok:
+                                    logger.debug("图片网站 %s 的选择器Lexbor不支持，改用BeautifulSoup解析: %s", domain, selector)
+                        
                         sites.append({
                             "domain": domain,
                             "category": category,
-                            "search_urls": search_urls
+                            "search_urls": search_urls,
+                            "selector": selector,
+                            "lexbor_ok": lexbor_ok
                         })
-                        print(f"[DEBUG] 添加图片网站: {domain}, 搜索URL: {len(search_urls)} 个")
+                        logger.debug("添加图片网站: %s, 搜索URL: %s 个", domain, len(search_urls))
         
         return sites
 
-    def _search_direct_site(self, domain: str, query: str, search_urls: List[str], timeout: int = 8) -> List[Dict[str, Any]]:
-        """直接访问网站搜索图片"""
+    def _search_direct_site(self, domain: str, query: str, search_urls: List[str], timeout: int = 8,
+                            selector: str = "", lexbor_ok: bool = True) -> List[Dict[str, Any]]:
+        """直接访问网站搜索图片（多个搜索URL同时请求，按配置顺序合并结果）"""
+        quoted_query = quote(query)
+        urls = [search_url.replace('{query}', quoted_query) for search_url in search_urls]
+        
+        # 复用共享会话的连接池，同一网站的各URL使用同一组请求头，只单独设置User-Agent和Accept
+        headers = {
+            'User-Agent': random.choice(self.USER_AGENTS),
+            'Accept': self.DIRECT_SITE_ACCEPT,
+        }
+        
+        if len(urls) == 1:
+            return self._fetch_site_images(domain, query, urls[0], headers, timeout, selector, lexbor_ok)
+        
+        # 调用方本身运行在_executor中，各URL使用单独的线程池请求，避免占满共享线程池时互相等待
+        futures = [
+            self._page_executor.submit(self._fetch_site_images, domain, query, url, headers, timeout, selector, lexbor_ok)
+            for url in urls
+        ]
         results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _fetch_site_images(self, domain: str, query: str, url: str, headers: Dict[str, str],
+                           timeout: int, selector: str = "", lexbor_ok: bool = True) -> List[Dict[str, Any]]:
+        """请求单个搜索URL并解析其中的图片，失败时返回空列表
         
-        for search_url in search_urls:
-            try:
-                # 替换查询参数
-                url = search_url.replace('{query}', quote(query))
-                print(f"[DEBUG] 直接访问: {url}")
-                
-                # 创建会话
-                session = requests.Session()
-                session.headers.update({
-                    'User-Agent': random.choice(self.USER_AGENTS),
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                })
-                
-                # 发送请求
-                response = session.get(url, timeout=timeout, verify=False)
-                print(f"[DEBUG] 请求URL: {url}")
-                print(f"[DEBUG] 响应状态: {response.status_code}, 内容长度: {len(response.content)}")
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    site_results = self._parse_site_images(soup, query, domain)
-                    results.extend(site_results)
-                    print(f"[DEBUG] {domain} 直接访问返回: {len(site_results)} 条结果")
-                else:
-                    print(f"[DEBUG] 请求失败，状态码: {response.status_code}")
-                    
-            except Exception as e:
-                print(f"[DEBUG] {domain} 直接访问失败: {e}")
+        lexbor_ok为False表示专用选择器只有soupsieve支持（由搜索计划检查），页面改用BeautifulSoup解析
+        """
+        try:
+            logger.debug("直接访问: %s", url)
+            
+            # 发送请求
+            response = self._send(self._session(), url, None, headers, timeout)
+            logger.debug("请求URL: %s", url)
+            logger.debug("响应状态: %s, 内容长度: %s", response.status_code, len(response.content))
+            
+            if response.status_code != 200:
+                logger.debug("请求失败，状态码: %s", response.status_code)
+                return []
+            
+            # Lexbor不会在<template>内容中查找元素，含<template>的页面交给lxml/BeautifulSoup解析；
+            # Lexbor不支持的选择器（soupsieve扩展语法）和lxml路径（只有通用的XPath）都改用BeautifulSoup
+            if (SELECTOLAX_AVAILABLE and not _TEMPLATE_TAG_RE.search(response.content)
+                    and lexbor_ok):
+                site_results = self._parse_site_images_selectolax(response.content, query, domain, selector)
+            elif LXML_AVAILABLE and not selector:
+                site_results = self._parse_site_images_lxml(_lxml_document(response.content), query, domain)
+            else:
+                soup = BeautifulSoup(response.content, _PARSER)
+                site_results = self._parse_site_images(soup, query, domain, selector)
+            logger.debug("%s 直接访问返回: %s 条结果", domain, len(site_results))
+            return site_results
+            
+        except Exception as e:
+            logger.debug("%s 直接访问失败: %s", domain, e)
+            return []
+
+    def _parse_site_images_selectolax(self, content: bytes, query: str, domain: str,
+                                      selector: str = "") -> List[Dict[str, Any]]:
+        """使用selectolax解析网站图片结果（与_parse_site_images的规则一致）
+        
+        Lexbor不能识别GBK等页面编码，先按BeautifulSoup相同的规则解码再交给selectolax
+        """
+        markup = UnicodeDammit(content, is_html=True).unicode_markup
+        tree = LexborHTMLParser(markup)
+        
+        # 网站配置了专用选择器时只处理其匹配的元素，没有结果再按通用规则扫描整页
+        if selector:
+            results = self._site_images_from_nodes(tree.css(selector), query, domain)
+            if results:
+                return results
+        
+        # 选择器列表中的元素同时匹配多个选择器时Lexbor会重复返回，img不带条件，没有图片地址的在下面跳过
+        return self._site_images_from_nodes(tree.css('img, a[href]'), query, domain)
+
+    def _site_images_from_nodes(self, nodes, query: str, domain: str) -> List[Dict[str, Any]]:
+        """从selectolax节点（img/a）中提取图片结果"""
+        results = []
+        seen = set()  # 同一页面中重复出现的图片只生成一条结果
+        
+        for node in nodes:
+            attrs = node.attributes
+            
+            # 获取图片URL
+            if node.tag == 'img':
+                img_url = attrs.get('src') or attrs.get('data-src') or attrs.get('data-original')
+            else:
+                href = attrs.get('href') or ''
+                img_url = href if self._IMG_LINK_EXT_RE.search(href) else None
+            
+            if not img_url:
                 continue
+            
+            # 处理相对URL（大多数已是完整的http(s)地址，先判断以跳过其余分支）
+            if not img_url.startswith('http'):
+                if img_url.startswith('//'):
+                    img_url = 'https:' + img_url
+                elif img_url[0] == '/':
+                    img_url = f"https://{domain}{img_url}"
+                else:
+                    img_url = f"https://{domain}/{img_url}"
+            
+            # 获取标题
+            title = attrs.get('alt') or attrs.get('title') or query
+            
+            # 检查是否是有效的图片内容
+            if img_url not in seen and self._is_image_content(img_url, title):
+                seen.add(img_url)
+                results.append({
+                    'title': title,
+                    'url': img_url,
+                    'snippet': img_url,
+                    'source': domain
+                })
         
         return results
 
-    def _parse_site_images(self, soup: BeautifulSoup, query: str, domain: str) -> List[Dict[str, Any]]:
-        """解析网站图片结果"""
+    def _parse_site_images_lxml(self, doc, query: str, domain: str) -> List[Dict[str, Any]]:
+        """在lxml文档树上解析网站图片结果（与_parse_site_images的规则一致）"""
         results = []
+        seen = set()  # 同一页面中重复出现的图片只生成一条结果
         
-        # 查找所有图片元素
-        img_elements = soup.find_all(['img', 'a'])
-        
-        for element in img_elements:
+        for element in _SITE_IMAGE_XPATH(doc):
+            try:
+                # 获取图片URL
+                img_url = None
+                if element.tag == 'img':
+                    img_url = element.get('src') or element.get('data-src') or element.get('data-original')
+                else:
+                    href = element.get('href')
+                    if self._IMG_LINK_EXT_RE.search(href):
+                        img_url = href
+                
+                if not img_url:
+                    continue
+                
+                # 处理相对URL（大多数已是完整的http(s)地址，先判断以跳过其余分支）
+                if not img_url.startswith('http'):
+                    if img_url.startswith('//'):
+                        img_url = 'https:' + img_url
+                    elif img_url[0] == '/':
+                        img_url = f"https://{domain}{img_url}"
+                    else:
+                        img_url = f"https://{domain}/{img_url}"
+                
+                # 获取标题
+                title = element.get('alt') or element.get('title') or query
+                
+                # 检查是否是有效的图片内容
+                if img_url not in seen and self._is_image_content(img_url, title):
+                    seen.add(img_url)
+                    results.append({
+                        'title': title,
+                        'url': img_url,
+                        'snippet': img_url,
+                        'source': domain
+                    })
+                    
+            except Exception as e:
+                logger.debug("解析图片元素失败: %s", e)
+                continue
+        
+        return results
+
+    def _parse_site_images(self, soup: BeautifulSoup, query: str, domain: str,
+                           selector: str = "") -> List[Dict[str, Any]]:
+        """解析网站图片结果（配置了专用选择器时优先只处理其匹配的元素）"""
+        if selector:
+            results = self._site_images_from_elements(soup.select(selector), query, domain)
+            if results:
+                return results
+        
+        # 查找所有可能带图片地址的元素
+        return self._site_images_from_elements(_SITE_IMAGE_SELECTOR.select(soup), query, domain)
+
+    def _site_images_from_elements(self, img_elements, query: str, domain: str) -> List[Dict[str, Any]]:
+        """从BeautifulSoup元素（img/a）中提取图片结果"""
+        results = []
+        seen = set()  # 同一页面中重复出现的图片只生成一条结果
+        
+        for element in img_elements:
             try:
                 # 获取图片URL
                 img_url = None
@@ -1806,25 +2785,27 @@ class ImageSearch(BaseSearch):
                     img_url = element.get('src') or element.get('data-src') or element.get('data-original')
                 elif element.name == 'a':
                     href = element.get('href', '')
-                    if any(ext in href.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
+                    if self._IMG_LINK_EXT_RE.search(href):
                         img_url = href
                 
                 if not img_url:
                     continue
                 
-                # 处理相对URL
-                if img_url.startswith('//'):
-                    img_url = 'https:' + img_url
-                elif img_url.startswith('/'):
-                    img_url = f"https://{domain}{img_url}"
-                elif not img_url.startswith('http'):
-                    img_url = f"https://{domain}/{img_url}"
+                # 处理相对URL（大多数已是完整的http(s)地址，先判断以跳过其余分支）
+                if not img_url.startswith('http'):
+                    if img_url.startswith('//'):
+                        img_url = 'https:' + img_url
+                    elif img_url[0] == '/':
+                        img_url = f"https://{domain}{img_url}"
+                    else:
+                        img_url = f"https://{domain}/{img_url}"
                 
                 # 获取标题
                 title = element.get('alt', '') or element.get('title', '') or query
                 
                 # 检查是否是有效的图片内容
-                if self._is_image_content(img_url, title):
+                if img_url not in seen and self._is_image_content(img_url, title):
+                    seen.add(img_url)
                     results.append({
                         'title': title,
                         'url': img_url,
@@ -1833,7 +2814,7 @@ class ImageSearch(BaseSearch):
                     })
                     
             except Exception as e:
-                print(f"[DEBUG] 解析图片元素失败: {e}")
+                logger.debug("解析图片元素失败: %s", e)
                 continue
         
         return results
@@ -1853,7 +2834,7 @@ class ImageSearch(BaseSearch):
             domains = custom_config.get("domains", [])
             
             # 检查域名是否已存在
-            if domain in domains:
+            if self._has_site_domain("image_sites", "custom", domain):
                 # 更新搜索URL
                 if search_urls:
                     search_urls_dict = custom_config.get("search_urls", {})
@@ -1886,32 +2867,26 @@ class ImageSearch(BaseSearch):
                 return {'success': True, 'action': 'added', 'message': f'图片搜索网站 {domain} 添加成功'}
                 
         except Exception as e:
-            print(f"[DEBUG] 添加图片搜索网站失败: {e}")
+            logger.debug("添加图片搜索网站失败: %s", e)
             return {'success': False, 'message': f'添加失败: {str(e)}'}
     
     def remove_site(self, domain: str, site_type: str) -> None:
         """删除网站"""
         try:
             # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
+            key = self.SITE_TYPE_KEYS.get(site_type)
+            if not key:
                 return
+            sites_config = self.config.get(key, {})
             
             # 从所有分类中删除指定域名
             for category, config in sites_config.items():
                 # 从域名列表中删除
                 domains = config.get("domains", [])
-                if domain in domains:
+                if self._has_site_domain(key, category, domain):
                     domains.remove(domain)
                     config["domains"] = domains
-                    print(f"[DEBUG] 从分类 {category} 中删除域名: {domain}")
+                    logger.debug("从分类 %s 中删除域名: %s", category, domain)
                 
                 # 从搜索URL中删除
                 search_urls = config.get("search_urls", {})
@@ -1926,40 +2901,30 @@ class ImageSearch(BaseSearch):
                     config["domain_status"] = domain_status
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 删除图片网站: {domain} ({site_type})")
+            self._schedule_save()
+            logger.debug("删除图片网站: %s (%s)", domain, site_type)
         except Exception as e:
-            print(f"[DEBUG] 删除图片网站失败: {e}")
+            logger.debug("删除图片网站失败: %s", e)
     
     def add_to_blacklist(self, domain: str) -> None:
         """添加到黑名单"""
         if "blacklist" not in self.config:
             self.config["blacklist"] = {"domains": [], "enabled": True}
         
-        if domain not in self.config["blacklist"]["domains"]:
+        if domain not in self._blacklist_domains:
             self.config["blacklist"]["domains"].append(domain)
             self._save_config()
     
     def remove_from_blacklist(self, domain: str) -> None:
         """从黑名单移除"""
-        if "blacklist" in self.config and domain in self.config["blacklist"]["domains"]:
+        if "blacklist" in self.config and domain in self._blacklist_domains:
             self.config["blacklist"]["domains"].remove(domain)
             self._save_config()
     
-    def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
-        """切换网站启用状态"""
+    def toggle(self, domain: str, enabled: bool) -> None:
+        """切换本类型网站的启用状态（网站类型已由调用方分派）"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新域名状态
             for category, config in sites_config.items():
@@ -1970,25 +2935,15 @@ class ImageSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 切换图片网站状态: {domain} -> {'启用' if enabled else '禁用'}")
+            self._schedule_save()
+            logger.debug("切换图片网站状态: %s -> %s", domain, '启用' if enabled else '禁用')
         except Exception as e:
-            print(f"[DEBUG] 切换图片网站状态失败: {e}")
+            logger.debug("切换图片网站状态失败: %s", e)
     
-    def get_site_search_urls(self, site_type: str, domain: str) -> list:
-        """获取指定网站的搜索URL"""
+    def get_search_urls(self, domain: str) -> list:
+        """获取本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return []
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 查找指定域名的搜索URL
             for category, config in sites_config.items():
@@ -1999,23 +2954,13 @@ class ImageSearch(BaseSearch):
             
             return []
         except Exception as e:
-            print(f"[DEBUG] 获取图片搜索URL失败: {e}")
+            logger.debug("获取图片搜索URL失败: %s", e)
             return []
     
-    def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
-        """更新指定网站的搜索URL"""
+    def update_search_urls(self, domain: str, search_urls: list) -> None:
+        """更新本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新指定域名的搜索URL
             for category, config in sites_config.items():
@@ -2026,15 +2971,18 @@ class ImageSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 更新图片网站 {domain} 的搜索URL: {search_urls}")
+            self._schedule_save()
+            logger.debug("更新图片网站 %s 的搜索URL: %s", domain, search_urls)
         except Exception as e:
-            print(f"[DEBUG] 更新图片搜索URL失败: {e}")
+            logger.debug("更新图片搜索URL失败: %s", e)
 
 
 class VideoSearch(BaseSearch):
     """视频搜索类"""
     
+    # 本类管理的配置中的网站列表键
+    SITE_KEY = "video_sites"
+    
     # 视频文件扩展名
     VIDEO_EXTENSIONS = [
         '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', 
@@ -2042,6 +2990,19 @@ class VideoSearch(BaseSearch):
         '.rmvb', '.ts', '.mts', '.m2ts', '.divx', '.xvid'
     ]
     
+    # 视频路径关键词
+    VIDEO_PATHS = (
+        '/videos', '/video', '/v/', '/play/', '/player/', '/watch/', '/movie/', '/tv/',
+        '/anime/', '/drama/', '/clip/', '/stream/', '/live/', '/x/', '/cover/', '/page/'
+    )
+    # URL中包含任一视频路径（区分大小写的子串匹配）
+    _VIDEO_PATH_RE = re.compile('|'.join(map(re.escape, VIDEO_PATHS)))
+    # 带参数的搜索/列表页：第一个?前的路径在域名之后（最后一个/前有.，没有/时整段含.），
+    # 且紧贴?的是search或视频路径关键词（去掉开头的/），关键词不区分大小写
+    _VIDEO_PARAM_REJECT_RE = re.compile(
+        r'\A(?=[^?]*\.[^?]*/|[^?/]*\.)[^?]*(?:search|'
+        + '|'.join(re.escape(path[1:]) for path in VIDEO_PATHS) + r')\?', re.I | re.A)
+    
     def __init__(self, config_file: str = "sites_config.json"):
         super().__init__(config_file)
         self.search_type = "videos"
@@ -2060,91 +3021,96 @@ class VideoSearch(BaseSearch):
             return False
         
         # 1. 如果是Bing的搜索页面URL，过滤掉
-        if 'bing.com' in url and ('search' in url or 'videos/search' in url):
-            print(f"[DEBUG] 过滤Bing搜索页面URL: {url}")
+        if 'bing.com' in url and 'search' in url:
+            logger.debug("过滤Bing搜索页面URL: %s", url)
             return False
         
-        # 2. 先检查是否包含视频路径关键词
-        video_paths = ['/videos', '/video', '/v/', '/play/', '/player/', '/watch/', '/movie/', '/tv/', '/anime/', '/drama/', '/clip/', '/stream/', '/live/', '/x/', '/cover/', '/page/']
-        has_video_path = any(path in url for path in video_paths)
+        # 2. 不包含视频路径关键词的全部过滤
+        if not self._VIDEO_PATH_RE.search(url):
+            logger.debug("过滤非视频内容: %s", url)
+            return False
         
-        if has_video_path:
-            # 3. 如果包含视频路径，检查是否不含?
-            question_pos = url.find('?')
-            if question_pos == -1:
-                # 不含?，直接保留
-                print(f"[DEBUG] 找到视频路径且无参数，保留URL: {url}")
-                return True
-            else:
-                # 4. 含?，检查是否在最后一个/后面
-                url_before_param = url[:question_pos]
-                last_slash_pos = url_before_param.rfind('/')
-                
-                if question_pos > last_slash_pos:
-                    # 5. ?在最后一个/后面，检查是否在域名后面/的后面
-                    domain_part = url_before_param[:last_slash_pos]
-                    if '.' in domain_part:
-                        # 6. 在域名后面/的后面，检查紧贴?前面的几个字母是否是search或视频路径关键词
-                        # 获取紧贴?前面的几个字母
-                        chars_before_param = url_before_param[-10:] if len(url_before_param) >= 10 else url_before_param  # 取最后10个字符
-                        has_search = chars_before_param.lower().endswith('search')
-                        has_video_path_before_param = any(chars_before_param.lower().endswith(path[1:]) for path in video_paths)
-                        
-                        if has_search or has_video_path_before_param:
-                            # 有search或视频路径关键词，过滤
-                            if has_search:
-                                print(f"[DEBUG] 过滤视频路径但有search的URL: {url}")
-                            else:
-                                print(f"[DEBUG] 过滤视频路径但?前有视频路径关键词的URL: {url}")
-                            return False
-                        else:
-                            # 没有search且没有视频路径关键词，保留
-                            print(f"[DEBUG] 找到视频路径且无search无视频路径关键词，保留URL: {url}")
-                            return True
-                    else:
-                        # 不在域名后面/的后面，保留
-                        print(f"[DEBUG] 找到视频路径且不在域名后，保留URL: {url}")
-                        return True
-                else:
-                    # ?不在最后一个/后面，保留
-                    print(f"[DEBUG] 找到视频路径且?不在最后/后，保留URL: {url}")
-                    return True
+        # 3. 带参数且?前是search或视频路径关键词的（搜索页、列表页）过滤，其余保留
+        if self._VIDEO_PARAM_REJECT_RE.search(url):
+            logger.debug("过滤视频路径但?前有search或视频路径关键词的URL: %s", url)
+            return False
         
-        # 7. 其他情况全部过滤
-        print(f"[DEBUG] 过滤非视频内容: {url}")
-        return False
+        logger.debug("找到视频路径，保留URL: %s", url)
+        return True
     
     def _search_bing(self, query: str, page: int = 0) -> List[Dict[str, Any]]:
         """使用Bing视频搜索"""
         s = self._session()
-        count = self.config.get("settings", {}).get("engine_max_results", 35)
+        count = self.engine_max_results
         first = max(0, int(page)) * count + 1
         
-        url = f"https://www.bing.com/videos/search?q={query}&setlang=zh-cn&count={count}&first={first}"
+        url = f"https://www.bing.com/videos/search?q={quote_plus(query)}&setlang=zh-cn&count={count}&first={first}"
         
         r = self._request(s, url)
         if not r:
             return []
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        if SELECTOLAX_AVAILABLE:
+            results = self._parse_search_results_selectolax(r.content, "bing")
+            if results is not None:
+                return results
+        
+        soup = _bing_soup(r.content)
         return self._parse_search_results(soup, query, "bing")
 
+    def _parse_search_results_selectolax(self, html: bytes, engine: str = "bing") -> Optional[List[Dict[str, Any]]]:
+        """使用selectolax解析视频搜索结果页面（与_parse_search_results的结构化解析一致）
+        
+        没有任何选择器匹配时返回None，由调用方回退到BeautifulSoup解析（尝试所有链接）
+        """
+        tree = LexborHTMLParser(html)
+        # BeautifulSoup的get_text()不包含脚本和样式内容，先移除这些节点保持标题一致
+        tree.strip_tags(['script', 'style'])
+        
+        for selector in _RESULT_SELECTORS:
+            items = tree.css(selector)
+            if not items:
+                continue
+            logger.debug("selectolax使用选择器 %s 找到 %s 个结果", selector, len(items))
+            
+            results = []
+            for item in items:
+                link_elem = item.css_first('a[href]')
+                if link_elem is None:
+                    continue
+                href = self._normalize_url(link_elem.attributes.get('href') or '')
+                if not href or self._is_blacklisted(href):
+                    continue
+                
+                title_elem = item.css_first('h2') or item.css_first('h3')
+                if title_elem is not None:
+                    title = title_elem.text().strip()
+                else:
+                    title = link_elem.text().strip()
+                
+                title = self._clean_title(title, href, "")
+                
+                # 使用视频内容筛选
+                if title and self._is_video_content(href, title):
+                    results.append({
+                        "title": title,
+                        "url": href,
+                        "snippet": "",
+                        "engine": engine
+                    })
+            return results
+        
+        return None
+
     def _parse_search_results(self, soup: BeautifulSoup, query: str, engine: str = "bing") -> List[Dict[str, Any]]:
         """解析视频搜索结果页面"""
         results = []
         
-        # 多种选择器尝试
-        selectors = [
-            'li.b_algo', 'li[class*="b_algo"]', '.b_algo', 
-            'li[class*="algo"]', 'li[class*="result"]', 
-            'div[class*="result"]', 'article', 'h2 a'
-        ]
-        
+        # 多种选择器尝试（合并为一次DOM遍历，按优先级取第一个有结果的选择器）
         found_results = False
-        for selector in selectors:
-            items = soup.select(selector)
+        for selector, items in _select_result_groups(soup):
             if items:
-                print(f"[DEBUG] 使用选择器 {selector} 找到 {len(items)} 个结果")
+                logger.debug("使用选择器 %s 找到 %s 个结果", selector, len(items))
                 found_results = True
                 
                 for item in items:
@@ -2172,14 +3138,14 @@ class VideoSearch(BaseSearch):
                                     "snippet": "",
                                     "engine": engine
                                 })
-                                print(f"[DEBUG] 找到{engine}视频结果: {title} - {href}")
+                                logger.debug("找到%s视频结果: %s - %s", engine, title, href)
                             else:
-                                print(f"[DEBUG] 过滤非视频内容: {title} - {href}")
+                                logger.debug("过滤非视频内容: %s - %s", title, href)
                 break
         
         # 如果没找到结构化结果，尝试所有链接
         if not found_results:
-            print(f"[DEBUG] 未找到结构化结果，尝试所有链接")
+            logger.debug("未找到结构化结果，尝试所有链接")
             all_links = soup.find_all('a', href=True)
             for link in all_links:
                 original_href = link.get('href', '')
@@ -2199,9 +3165,9 @@ class VideoSearch(BaseSearch):
                             "snippet": "",
                             "engine": engine
                         })
-                        print(f"[DEBUG] 找到{engine}视频链接结果: {title} - {href}")
+                        logger.debug("找到%s视频链接结果: %s - %s", engine, title, href)
                     else:
-                        print(f"[DEBUG] 过滤非视频内容: {title} - {href}")
+                        logger.debug("过滤非视频内容: %s - %s", title, href)
         
         return results
 
@@ -2210,28 +3176,21 @@ class VideoSearch(BaseSearch):
         if not query or len(query.strip()) < 1:
             return []
         
-        results = []
-        
         try:
             # 使用Bing视频搜索
             bing_results = self._search_bing(query, page)
-            results.extend(bing_results)
             
-            # 去重
-            seen = set()
-            dedup = []
+            # 按URL去重：字典保持插入顺序，setdefault 保留首次出现的结果
+            unique = {}
+            for item in bing_results:
+                url = item.get("url")
+                if url:
+                    unique.setdefault(url, item)
             
-            for item in results:
-                url = item.get("url", "")
-                if url and url not in seen:
-                    seen.add(url)
-                    dedup.append(item)
-            
-            return dedup
+            return list(unique.values())
             
         except Exception as e:
-            print(f"[DEBUG] 视频搜索异常: {e}")
-            traceback.print_exc()
+            logger.exception("视频搜索异常: %s", e)
             return []
     
     def get_all_sites(self) -> Dict[str, Any]:
@@ -2249,7 +3208,7 @@ class VideoSearch(BaseSearch):
             domains = custom_config.get("domains", [])
             
             # 检查域名是否已存在
-            if domain in domains:
+            if self._has_site_domain("video_sites", "custom", domain):
                 # 更新搜索URL
                 if search_urls:
                     search_urls_dict = custom_config.get("search_urls", {})
@@ -2282,30 +3241,24 @@ class VideoSearch(BaseSearch):
                 return {'success': True, 'action': 'added', 'message': f'视频搜索网站 {domain} 添加成功'}
                 
         except Exception as e:
-            print(f"[DEBUG] 添加视频搜索网站失败: {e}")
+            logger.debug("添加视频搜索网站失败: %s", e)
             return {'success': False, 'message': f'添加失败: {str(e)}'}
     
     def remove_site(self, domain: str, site_type: str) -> None:
         """删除网站"""
         try:
             # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
+            key = self.SITE_TYPE_KEYS.get(site_type)
+            if not key:
                 return
+            sites_config = self.config.get(key, {})
             
             # 从配置中删除指定域名
             for category, config in sites_config.items():
                 if config.get("enabled", True):
                     # 从域名列表中删除
                     domains = config.get("domains", [])
-                    if domain in domains:
+                    if self._has_site_domain(key, category, domain):
                         domains.remove(domain)
                         config["domains"] = domains
                     
@@ -2324,40 +3277,30 @@ class VideoSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 删除视频网站: {domain} ({site_type})")
+            self._schedule_save()
+            logger.debug("删除视频网站: %s (%s)", domain, site_type)
         except Exception as e:
-            print(f"[DEBUG] 删除视频网站失败: {e}")
+            logger.debug("删除视频网站失败: %s", e)
     
     def add_to_blacklist(self, domain: str) -> None:
         """添加到黑名单"""
         if "blacklist" not in self.config:
             self.config["blacklist"] = {"domains": [], "enabled": True}
         
-        if domain not in self.config["blacklist"]["domains"]:
+        if domain not in self._blacklist_domains:
             self.config["blacklist"]["domains"].append(domain)
             self._save_config()
     
     def remove_from_blacklist(self, domain: str) -> None:
         """从黑名单移除"""
-        if "blacklist" in self.config and domain in self.config["blacklist"]["domains"]:
+        if "blacklist" in self.config and domain in self._blacklist_domains:
             self.config["blacklist"]["domains"].remove(domain)
             self._save_config()
     
-    def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
-        """切换网站启用状态"""
+    def toggle(self, domain: str, enabled: bool) -> None:
+        """切换本类型网站的启用状态（网站类型已由调用方分派）"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新域名状态
             for category, config in sites_config.items():
@@ -2368,25 +3311,15 @@ class VideoSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 切换视频网站状态: {domain} -> {'启用' if enabled else '禁用'}")
+            self._schedule_save()
+            logger.debug("切换视频网站状态: %s -> %s", domain, '启用' if enabled else '禁用')
         except Exception as e:
-            print(f"[DEBUG] 切换视频网站状态失败: {e}")
+            logger.debug("切换视频网站状态失败: %s", e)
     
-    def get_site_search_urls(self, site_type: str, domain: str) -> list:
-        """获取指定网站的搜索URL"""
+    def get_search_urls(self, domain: str) -> list:
+        """获取本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return []
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 查找指定域名的搜索URL
             for category, config in sites_config.items():
@@ -2397,23 +3330,13 @@ class VideoSearch(BaseSearch):
             
             return []
         except Exception as e:
-            print(f"[DEBUG] 获取视频搜索URL失败: {e}")
+            logger.debug("获取视频搜索URL失败: %s", e)
             return []
     
-    def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
-        """更新指定网站的搜索URL"""
+    def update_search_urls(self, domain: str, search_urls: list) -> None:
+        """更新本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新指定域名的搜索URL
             for category, config in sites_config.items():
@@ -2424,15 +3347,18 @@ class VideoSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 更新视频网站 {domain} 的搜索URL: {search_urls}")
+            self._schedule_save()
+            logger.debug("更新视频网站 %s 的搜索URL: %s", domain, search_urls)
         except Exception as e:
-            print(f"[DEBUG] 更新视频搜索URL失败: {e}")
+            logger.debug("更新视频搜索URL失败: %s", e)
 
 
 class ResourceSearch(BaseSearch):
     """资源搜索类"""
     
+    # 本类管理的配置中的网站列表键
+    SITE_KEY = "resource_sites"
+    
     RESOURCE_KEYWORDS = [
         "下载", "资源", "百度网盘", "网盘", "夸克网盘", "阿里云盘", "天翼云", "蓝奏云", "115网盘",
         "magnet:", "磁力", "torrent", "种子", "直链", "度盘", "提取码", "分享链接"
@@ -2442,98 +3368,166 @@ class ResourceSearch(BaseSearch):
         super().__init__(config_file)
         self.search_type = "resources"
     
-    def _normalize_text(self, text: str) -> str:
-        """标准化文本，处理符号变体"""
-        import re
-        # 替换常见的符号变体
-        text = re.sub(r'[＊*·•·]', '*', text)  # 统一星号变体
-        text = re.sub(r'[：:]', ':', text)      # 统一冒号变体
-        text = re.sub(r'[（）()]', '', text)    # 移除括号
-        text = re.sub(r'[，,。.]', '', text)    # 移除标点
-        return text.strip()
-    
-    def _super_loose_match(self, query: str, title: str) -> bool:
+    def _super_loose_match(self, pq: PreparedQuery, title: str) -> bool:
         """超宽松匹配：处理符号变体和部分匹配"""
-        query_lower = query.lower()
         title_lower = title.lower()
         
+        # 原始文本包含查询词时标准化后也必然包含，无需标准化
+        if pq.lower in title_lower:
+            return True
+        
+        # 与原始标题没有共同字符时标准化后也没有，同样无需标准化
+        if pq.quick_chars is not None and pq.quick_chars.isdisjoint(title_lower):
+            return False
+        
         # 标准化文本
-        normalized_query = self._normalize_text(query_lower)
-        normalized_title = self._normalize_text(title_lower)
+        normalized_title = _normalize_text(title_lower)
         
         # 检查标准化后的完整匹配
-        if normalized_query in normalized_title:
+        if pq.norm in normalized_title:
             return True
         
-        # 检查部分匹配（至少50%的查询词匹配）
-        query_chars = set(normalized_query.replace(' ', ''))
-        title_chars = set(normalized_title.replace(' ', ''))
-        if len(query_chars) > 0:
-            match_ratio = len(query_chars & title_chars) / len(query_chars)
-            if match_ratio >= 0.5:  # 至少50%的字符匹配
-                return True
-        
-        # 超宽松匹配：只要有一个字相同就不过滤（优先级低但不过滤）
-        if len(query_chars) > 0:
-            common_chars = query_chars & title_chars
-            if len(common_chars) > 0:  # 至少有一个字符相同
-                return True
-        
-        return False
+        # 超宽松匹配：只要有一个字相同就不过滤（优先级低但不过滤）；
+        # 50%字符匹配的情况已包含在内，不再单独计算匹配度。
+        # 查询字符集合不含空格，可以直接与标准化后的标题比较，找到一个共同字符即返回
+        return bool(pq.chars) and not pq.chars.isdisjoint(normalized_title)
     
     def _is_relevant_content(self, title: str, url: str, query: str) -> bool:
         """检查内容是否与资源搜索相关"""
         if not title or not query:
             return True
         
-        title_lower = title.lower()
-        query_lower = query.lower()
-        
-        # 过滤掉明显的无关内容
-        irrelevant_keywords = [
-            '登录', 'login', '注册', 'register', '首页', 'home', '关于', 'about',
-            '联系我们', 'contact', '帮助', 'help', '隐私', 'privacy', '条款', 'terms',
-            '广告', 'ad', '推广', 'promotion', '招聘', 'job', '招聘信息',
-            '新闻', 'news', '公告', 'notice', '更新', 'update', '维护', 'maintenance'
-        ]
+        return self._is_relevant_title(_prepare_query(query), title)
+    
+    def _is_relevant_title(self, pq: PreparedQuery, title: str) -> bool:
+        """使用预处理后的查询词检查标题相关性，同一次搜索中查询词只处理一次"""
+        if self._is_irrelevant_title(title, title.lower()):
+            return False
         
-        if any(keyword in title_lower for keyword in irrelevant_keywords):
+        return self._super_loose_match(pq, title)
+    
+    def _is_irrelevant_title(self, title: str, title_lower: str) -> bool:
+        """标题是否包含明显无关的关键词（登录、首页、广告等）"""
+        # 英文关键词均为小写，匹配小写后的标题；不含中文的标题跳过中文关键词
+        if AHOCORASICK_AVAILABLE:
+            for _ in _IRRELEVANT_AUTOMATON.iter(title_lower):
+                return True
             return False
+        if _RE_IRRELEVANT_ASCII.search(title_lower):
+            return True
+        return bool(_RE_CJK.search(title) and _RE_IRRELEVANT_CJK.search(title))
+    
+    def _score_title(self, pq: PreparedQuery, title: str) -> Optional[int]:
+        """过滤并计算排序分数，标题只小写和标准化一次
         
-        return self._super_loose_match(query, title)
+        标题明显无关或与查询词没有共同字符时返回None（与_is_relevant_title一致），
+        空标题不过滤；否则返回排序分数，字符匹配度高的分数更高
+        """
+        title_lower = title.lower()
+        
+        # 快速排除：与原始标题没有共同字符时标准化后也没有，也不可能完整匹配，无需标准化
+        if title and pq.quick_chars is not None and pq.quick_chars.isdisjoint(title_lower):
+            return None
+        
+        normalized_title = _normalize_text(title_lower)
+        
+        # 完整匹配最高分（原始标题包含查询词时标准化后也必然包含）
+        full_match = pq.norm in normalized_title
+        if title:
+            if self._is_irrelevant_title(title, title_lower):
+                return None
+            if not full_match and (not pq.chars or pq.chars.isdisjoint(normalized_title)):
+                return None
+        
+        # 基础匹配分数
+        score = title_lower.count(pq.lower) * 10
+        
+        if full_match:
+            score += 1000
+        elif pq.chars:
+            # 部分匹配按匹配度给分（查询字符集合不含空格，可直接与标准化后的标题求交集）
+            match_ratio = len(pq.chars.intersection(normalized_title)) / len(pq.chars)
+            score += int(match_ratio * 500)  # 匹配度越高分数越高
+        else:
+            # 即使没有匹配，也给一个基础分数，确保不被过滤
+            score += 1
+        
+        return score
     
     def _search_bing(self, query: str, page: int = 0) -> List[Dict[str, Any]]:
         """使用Bing资源搜索"""
         s = self._session()
-        count = self.config.get("settings", {}).get("engine_max_results", 35)
+        count = self.engine_max_results
         first = max(0, int(page)) * count + 1
         
         # 为资源搜索使用更宽松的搜索条件，不限制文件类型
-        url = f"https://www.bing.com/search?q={query} 下载 OR 资源 OR 游戏&setlang=zh-cn&count={count}&first={first}"
+        url = f"https://www.bing.com/search?q={quote_plus(query + ' 下载 OR 资源 OR 游戏')}&setlang=zh-cn&count={count}&first={first}"
         
         r = self._request(s, url)
         if not r:
             return []
         
-        soup = BeautifulSoup(r.content, 'html.parser')
+        if SELECTOLAX_AVAILABLE:
+            results = self._parse_search_results_selectolax(r.content, query, "bing")
+            if results is not None:
+                return results
+        
+        soup = _bing_soup(r.content)
         return self._parse_search_results(soup, query, "bing")
     
+    def _parse_search_results_selectolax(self, html: bytes, query: str, engine: str = "bing") -> Optional[List[Dict[str, Any]]]:
+        """使用selectolax解析资源搜索结果页面（与_parse_search_results的结构化解析一致）
+        
+        没有任何选择器匹配时返回None，由调用方回退到BeautifulSoup解析（尝试所有链接）
+        """
+        tree = LexborHTMLParser(html)
+        # BeautifulSoup的get_text()不包含脚本和样式内容，先移除这些节点保持标题一致
+        tree.strip_tags(['script', 'style'])
+        
+        for selector in _RESULT_SELECTORS:
+            items = tree.css(selector)
+            if not items:
+                continue
+            logger.debug("selectolax使用选择器 %s 找到 %s 个结果", selector, len(items))
+            
+            results = []
+            for item in items:
+                link_elem = item.css_first('a[href]')
+                if link_elem is None:
+                    continue
+                href = self._normalize_url(link_elem.attributes.get('href') or '')
+                if not href or self._is_blacklisted(href):
+                    continue
+                
+                title_elem = item.css_first('h2') or item.css_first('h3')
+                if title_elem is not None:
+                    title = title_elem.text().strip()
+                else:
+                    title = link_elem.text().strip()
+                
+                title = self._clean_title(title, href, "")
+                
+                # 检查内容相关性
+                if title and self._is_relevant_content(title, href, query):
+                    results.append({
+                        "title": title,
+                        "url": href,
+                        "snippet": "",
+                        "engine": engine
+                    })
+            return results
+        
+        return None
+    
     def _parse_search_results(self, soup: BeautifulSoup, query: str, engine: str = "bing") -> List[Dict[str, Any]]:
         """解析资源搜索结果页面"""
         results = []
         
-        # 多种选择器尝试
-        selectors = [
-            'li.b_algo', 'li[class*="b_algo"]', '.b_algo', 
-            'li[class*="algo"]', 'li[class*="result"]', 
-            'div[class*="result"]', 'article', 'h2 a'
-        ]
-        
+        # 多种选择器尝试（合并为一次DOM遍历，按优先级取第一个有结果的选择器）
         found_results = False
-        for selector in selectors:
-            items = soup.select(selector)
+        for selector, items in _select_result_groups(soup):
             if items:
-                print(f"[DEBUG] 使用选择器 {selector} 找到 {len(items)} 个结果")
+                logger.debug("使用选择器 %s 找到 %s 个结果", selector, len(items))
                 found_results = True
                 
                 for item in items:
@@ -2561,14 +3555,14 @@ class ResourceSearch(BaseSearch):
                                     "snippet": "",
                                     "engine": engine
                                 })
-                                print(f"[DEBUG] 找到{engine}资源结果: {title} - {href}")
+                                logger.debug("找到%s资源结果: %s - %s", engine, title, href)
                             else:
-                                print(f"[DEBUG] 过滤不相关资源: {title} - {href}")
+                                logger.debug("过滤不相关资源: %s - %s", title, href)
                 break
         
         # 如果没找到结构化结果，尝试所有链接
         if not found_results:
-            print(f"[DEBUG] 未找到结构化结果，尝试所有链接")
+            logger.debug("未找到结构化结果，尝试所有链接")
             all_links = soup.find_all('a', href=True)
             for link in all_links:
                 original_href = link.get('href', '')
@@ -2588,21 +3582,35 @@ class ResourceSearch(BaseSearch):
                             "snippet": "",
                             "engine": engine
                         })
-                        print(f"[DEBUG] 找到{engine}资源链接结果: {title} - {href}")
+                        logger.debug("找到%s资源链接结果: %s - %s", engine, title, href)
                     else:
-                        print(f"[DEBUG] 过滤不相关资源: {title} - {href}")
+                        logger.debug("过滤不相关资源: %s - %s", title, href)
         
         return results
 
     def _parse_resource_site_results(self, soup: BeautifulSoup, query: str, domain: str) -> List[Dict[str, Any]]:
         """解析资源网站搜索结果页面 - 通用解析策略"""
+        # 通用解析策略：查找所有链接（find_all走bs4的过滤器，不经过CSS选择器引擎）
+        links = ((item.get('href', ''), item.get_text()) for item in soup.find_all('a', href=True))
+        return self._resource_site_results_from_links(links, domain)
+
+    def _parse_resource_site_results_selectolax(self, content: bytes, query: str, domain: str) -> List[Dict[str, Any]]:
+        """使用selectolax解析资源网站搜索结果页面（与_parse_resource_site_results的规则一致）
+        
+        Lexbor不能识别GBK等页面编码，先按BeautifulSoup相同的规则解码再交给selectolax
+        """
+        markup = UnicodeDammit(content, is_html=True).unicode_markup
+        tree = LexborHTMLParser(markup)
+        # BeautifulSoup的get_text()不包含脚本和样式内容，先移除这些节点保持标题一致
+        tree.strip_tags(['script', 'style'])
+        links = ((node.attributes.get('href') or '', node.text()) for node in tree.css('a[href]'))
+        return self._resource_site_results_from_links(links, domain)
+
+    def _resource_site_results_from_links(self, links, domain: str) -> List[Dict[str, Any]]:
+        """从(href, 链接文本)序列中提取资源网站结果"""
         results = []
         
-        # 通用解析策略：查找所有链接
-        items = soup.select('a[href]')
-        for item in items:
-            href = item.get('href', '')
-            
+        for href, text in links:
             # 处理相对URL
             if href.startswith('/'):
                 href = f"https://{domain}{href}"
@@ -2615,15 +3623,13 @@ class ResourceSearch(BaseSearch):
                 continue
             
             # 获取标题
-            title = item.get_text().strip()
+            title = text.strip()
             
             # 过滤条件
             if (title and href and 
                 len(title) > 3 and  # 标题长度
-                not href.startswith('javascript:') and  # 跳过JS链接
-                not href.startswith('mailto:') and  # 跳过邮箱链接
-                not href.startswith('#') and  # 跳过锚点链接
-                not title.lower() in ['更多', 'more', '下一页', 'next', '上一页', 'prev']):  # 跳过导航链接
+                not href.startswith(('javascript:', 'mailto:', '#')) and  # 跳过JS、邮箱和锚点链接
+                title.lower() not in _NAV_TITLES):  # 跳过导航链接
                 
                 results.append({
                     "title": title,
@@ -2631,31 +3637,46 @@ class ResourceSearch(BaseSearch):
                     "snippet": f"来自 {domain} 的资源",
                     "engine": domain
                 })
-                print(f"[DEBUG] 找到{domain}资源链接结果: {title} - {href}")
+                logger.debug("找到%s资源链接结果: %s - %s", domain, title, href)
         
         return results
 
     def _get_sites_by_type(self, stype: str, category: str = '') -> List[Dict[str, Any]]:
-        """获取指定类型的网站列表"""
+        """获取指定类型的网站列表（使用缓存的搜索计划，配置保存后自动重建）"""
+        if category == 'all':
+            category = ''
+        elif category and category not in self.config.get("resource_sites", {}):
+            # 不存在的分类不缓存，避免任意分类名使缓存无限增长
+            logger.debug("分类 %s 不存在，返回空结果", category)
+            return []
+        
+        key = (stype, category)
+        sites = self._site_plans.get(key)
+        if sites is None:
+            sites = self._site_plans[key] = self._build_sites_by_type(stype, category)
+        return sites
+
+    def _build_sites_by_type(self, stype: str, category: str = '') -> List[Dict[str, Any]]:
+        """根据当前配置生成指定类型的网站列表"""
         sites = []
         
         if stype in ['files', 'resources']:
             # 资源搜索
             resource_sites = self.config.get("resource_sites", {})
-            print(f"[DEBUG] 配置中的资源站点类别: {list(resource_sites.keys())}")
+            logger.debug("配置中的资源站点类别: %s", list(resource_sites.keys()))
             
             # 如果指定了分类，只搜索该分类的网站
             if category and category != 'all':
                 if category in resource_sites:
                     categories_to_search = [category]
-                    print(f"[DEBUG] 按分类过滤: {category}")
+                    logger.debug("按分类过滤: %s", category)
                 else:
-                    print(f"[DEBUG] 分类 {category} 不存在，返回空结果")
+                    logger.debug("分类 %s 不存在，返回空结果", category)
                     return []
             else:
                 # 搜索所有分类（包括category为空或'all'的情况）
                 categories_to_search = list(resource_sites.keys())
-                print(f"[DEBUG] 搜索所有分类: {categories_to_search}")
+                logger.debug("搜索所有分类: %s", categories_to_search)
             
             # 获取custom分类的URL和状态信息（主配置）
             custom_config = resource_sites.get("custom", {})
@@ -2667,24 +3688,24 @@ class ResourceSearch(BaseSearch):
             
             for category_name in categories_to_search:
                 config = resource_sites[category_name]
-                print(f"[DEBUG] 处理资源类别: {category_name}, 启用状态: {config.get('enabled', True)}")
+                logger.debug("处理资源类别: %s, 启用状态: %s", category_name, config.get('enabled', True))
                 if config.get("enabled", True):
                     domains = config.get("domains", [])
-                    print(f"[DEBUG] {category_name} 类别下的域名: {domains}")
+                    logger.debug("%s 类别下的域名: %s", category_name, domains)
                     for domain in domains:
                         # 避免重复搜索同一个网站
                         if domain in processed_domains:
-                            print(f"[DEBUG] 跳过已处理的网站: {domain}")
+                            logger.debug("跳过已处理的网站: %s", domain)
                             continue
                         
                         # 从custom分类中获取域名的禁用状态
                         if domain in custom_domain_status and not custom_domain_status[domain]:
-                            print(f"[DEBUG] 跳过禁用的资源网站: {domain}")
+                            logger.debug("跳过禁用的资源网站: %s", domain)
                             continue
                         
                         # 从custom分类中获取搜索URL
                         search_urls = custom_search_urls.get(domain, [])
-                        print(f"[DEBUG] 添加资源网站: {domain}, 搜索URL数量: {len(search_urls)}")
+                        logger.debug("添加资源网站: %s, 搜索URL数量: %s", domain, len(search_urls))
                         sites.append({
                             "domain": domain,
                             "category": category_name,
@@ -2695,136 +3716,113 @@ class ResourceSearch(BaseSearch):
         return sites
 
     def _search_direct_site(self, domain: str, query: str, search_urls: List[str], timeout: int = 8) -> List[Dict[str, Any]]:
-        """直接访问网站搜索"""
+        """直接访问网站搜索（多个搜索URL同时请求，按配置顺序合并结果）"""
+        # 替换查询参数（查询词可能出现在路径或参数中，统一百分号编码）
+        quoted_query = quote(query)
+        urls = [search_url.replace('{query}', quoted_query) for search_url in search_urls]
+        
+        if len(urls) == 1:
+            return self._fetch_site_results(domain, query, urls[0])
+        
+        # 调用方本身运行在_executor中，各URL使用单独的线程池请求，避免占满共享线程池时互相等待；
+        # 各URL同时请求，总耗时取决于最慢的一个，不再需要按已用时间提前中断
+        futures = [
+            self._page_executor.submit(self._fetch_site_results, domain, query, url)
+            for url in urls
+        ]
         results = []
-        s = self._session()
-        start_time = time.time()
-        
-        for search_url in search_urls:
-            # 检查单个网站的超时
-            if time.time() - start_time > timeout:
-                print(f"[DEBUG] {domain} 搜索超时({timeout}秒)，已搜索 {len(results)} 条结果")
-                break
-                
-            try:
-                # 替换查询参数
-                url = search_url.replace('{query}', query)
-                print(f"[DEBUG] 直接访问: {url}")
-                
-                r = self._request(s, url)
-                if not r:
-                    continue
-                
-                soup = BeautifulSoup(r.content, 'html.parser')
-                site_results = self._parse_resource_site_results(soup, query, domain)
-                results.extend(site_results)
-                print(f"[DEBUG] {domain} 直接访问返回: {len(site_results)} 条结果")
-                
-            except Exception as e:
-                print(f"[DEBUG] {domain} 直接访问失败: {e}")
-                continue
-        
+        for future in futures:
+            results.extend(future.result())
         return results
 
+    def _fetch_site_results(self, domain: str, query: str, url: str) -> List[Dict[str, Any]]:
+        """请求单个搜索URL并解析其中的资源链接，失败时返回空列表"""
+        try:
+            logger.debug("直接访问: %s", url)
+            
+            r = self._request(self._session(), url)
+            if not r:
+                return []
+            
+            # Lexbor不会在<template>内容中查找元素，含<template>的页面交给BeautifulSoup解析
+            if SELECTOLAX_AVAILABLE and not _TEMPLATE_TAG_RE.search(r.content):
+                site_results = self._parse_resource_site_results_selectolax(r.content, query, domain)
+            else:
+                soup = BeautifulSoup(r.content, _PARSER)
+                site_results = self._parse_resource_site_results(soup, query, domain)
+            logger.debug("%s 直接访问返回: %s 条结果", domain, len(site_results))
+            return site_results
+            
+        except Exception as e:
+            logger.debug("%s 直接访问失败: %s", domain, e)
+            return []
+
     def search(self, query: str, page: int = 0, limit: Optional[int] = None, category: str = '') -> List[Dict[str, Any]]:
         """资源搜索主函数"""
         if not query or len(query.strip()) < 1:
             return []
         
         results = []
+        # 查询词在整次搜索中不变，预处理一次供过滤和排序复用
+        pq = _prepare_query(query)
         
         try:
             # 1. 直接访问配置的资源网站
             sites = self._get_sites_by_type('resources', category)
-            print(f"[DEBUG] 找到 {len(sites)} 个资源网站: {[site['domain'] for site in sites]}")
-            timeout_per_site = self.config.get("settings", {}).get("site_timeout", 8)  # 每个网站的超时时间
+            logger.debug("找到 %s 个资源网站: %s", len(sites), [site['domain'] for site in sites])
+            timeout_per_site = self.site_timeout  # 每个网站的超时时间
             
-            for i, site_info in enumerate(sites, 1):
+            # 使用共享线程池并发访问所有资源网站，总耗时取决于最慢的网站
+            futures = []
+            for site_info in sites:
                 domain = site_info["domain"]
                 search_urls = site_info.get("search_urls", [])
-                
-                print(f"[DEBUG] 开始搜索资源网站 ({i}/{len(sites)}): {domain}")
-                
                 if search_urls:
                     # 有直接搜索URL的资源网站
-                    print(f"[DEBUG] {domain} 使用直接搜索URL: {search_urls}")
-                    direct_results = self._search_direct_site(domain, query, search_urls, timeout_per_site)
-                    
-                    # 对直接访问结果进行相关性过滤
-                    filtered_results = []
-                    for result in direct_results:
-                        if self._is_relevant_content(result.get("title", ""), result.get("url", ""), query):
-                            filtered_results.append(result)
-                        else:
-                            print(f"[DEBUG] 过滤{domain}不相关内容: {result.get('title', '')} - {result.get('url', '')}")
-                    
-                    results.extend(filtered_results)
-                    print(f"[DEBUG] {domain} 直接访问返回: {len(direct_results)} 条，过滤后: {len(filtered_results)} 条")
+                    logger.debug("%s 使用直接搜索URL: %s", domain, search_urls)
+                    futures.append((domain, self._executor.submit(
+                        self._search_direct_site, domain, query, search_urls, timeout_per_site)))
                 else:
-                    print(f"[DEBUG] {domain} 没有配置搜索URL，跳过")
-            
-            print(f"[DEBUG] 资源搜索完成，共搜索了 {len(sites)} 个网站（每个网站超时{timeout_per_site}秒），获得 {len(results)} 条结果")
-            
-            # 去重
-            seen = set()
-            dedup = []
-            
-            for item in results:
-                url = item.get("url", "")
-                if url and url not in seen:
-                    seen.add(url)
-                    dedup.append(item)
-            
-            # 按相关性排序，字符匹配度高的优先级更高，但不过滤任何结果
-            def get_priority_score(item):
-                title = item.get('title', '').lower()
-                url = item.get('url', '').lower()
-                query_lower = query.lower()
-                
-                score = 0
-                
-                # 基础匹配分数
-                score += title.count(query_lower) * 10
-                
-                # 计算字符匹配度
-                def normalize_text(text):
-                    import re
-                    text = re.sub(r'[＊*·•·]', '*', text)
-                    text = re.sub(r'[：:]', ':', text)
-                    text = re.sub(r'[（）()]', '', text)
-                    text = re.sub(r'[，,。.]', '', text)
-                    return text.strip()
-                
-                normalized_query = normalize_text(query_lower)
-                normalized_title = normalize_text(title)
-                
-                # 完整匹配最高分
-                if normalized_query in normalized_title:
-                    score += 1000
-                else:
-                    # 部分匹配按匹配度给分
-                    query_chars = set(normalized_query.replace(' ', ''))
-                    title_chars = set(normalized_title.replace(' ', ''))
-                    if len(query_chars) > 0:
-                        match_ratio = len(query_chars & title_chars) / len(query_chars)
-                        score += int(match_ratio * 500)  # 匹配度越高分数越高
-                    else:
-                        # 即使没有匹配，也给一个基础分数，确保不被过滤
-                        score += 1
-                
+                    logger.debug("%s 没有配置搜索URL，跳过", domain)
+            
+            # 按网站配置顺序收集结果，保证去重时的优先级不受完成顺序影响
+            for domain, future in futures:
+                try:
+                    direct_results = future.result()
+                except Exception as e:
+                    logger.debug("%s 资源搜索失败: %s", domain, e)
+                    continue
                 
-
+                # 对直接访问结果进行相关性过滤，同时计算排序分数（每个标题只处理一次）
+                filtered_count = 0
+                for result in direct_results:
+                    score = self._score_title(pq, result.get("title", ""))
+                    if score is None:
+                        logger.debug("过滤%s不相关内容: %s - %s", domain, result.get('title', ''), result.get('url', ''))
+                        continue
+                    results.append((result, score))
+                    filtered_count += 1
                 
-                return score
+                logger.debug("%s 直接访问返回: %s 条，过滤后: %s 条", domain, len(direct_results), filtered_count)
+            
+            logger.debug("资源搜索完成，共搜索了 %s 个网站（每个网站超时%s秒），获得 %s 条结果", len(sites), timeout_per_site, len(results))
+            
+            # 按URL去重：字典保持插入顺序，setdefault 保留首次出现的结果及其分数
+            unique = {}
+            for item, score in results:
+                url = item.get("url")
+                if url:
+                    unique.setdefault(url, (item, score))
             
-            dedup.sort(key=get_priority_score, reverse=True)
+            # 按过滤时算好的相关性分数排序（稳定排序，同分保持网站顺序），不过滤任何结果
+            scored = sorted(unique.values(), key=itemgetter(1), reverse=True)
+            dedup = [item for item, _ in scored]
             
-            print(f"[DEBUG] 资源搜索总计: {len(results)} 条结果，去重后: {len(dedup)} 条")
+            logger.debug("资源搜索总计: %s 条结果，去重后: %s 条", len(results), len(dedup))
             return dedup
             
         except Exception as e:
-            print(f"[DEBUG] 资源搜索异常: {e}")
-            traceback.print_exc()
+            logger.exception("资源搜索异常: %s", e)
             return []
     
     def get_all_sites(self) -> Dict[str, Any]:
@@ -2857,7 +3855,7 @@ class ResourceSearch(BaseSearch):
             domains = target_config.get("domains", [])
             
             # 检查域名是否已存在
-            if domain in domains:
+            if self._has_site_domain("resource_sites", category, domain):
                 # 更新搜索URL
                 if search_urls:
                     search_urls_dict = target_config.get("search_urls", {})
@@ -2890,32 +3888,26 @@ class ResourceSearch(BaseSearch):
                 return {'success': True, 'action': 'added', 'message': f'资源搜索网站 {domain} 添加成功'}
                 
         except Exception as e:
-            print(f"[DEBUG] 添加资源搜索网站失败: {e}")
+            logger.debug("添加资源搜索网站失败: %s", e)
             return {'success': False, 'message': f'添加失败: {str(e)}'}
     
     def remove_site(self, domain: str, site_type: str) -> None:
         """删除网站"""
         try:
             # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
+            key = self.SITE_TYPE_KEYS.get(site_type)
+            if not key:
                 return
+            sites_config = self.config.get(key, {})
             
             # 从所有分类中删除指定域名
             for category, config in sites_config.items():
                 # 从域名列表中删除
                 domains = config.get("domains", [])
-                if domain in domains:
+                if self._has_site_domain(key, category, domain):
                     domains.remove(domain)
                     config["domains"] = domains
-                    print(f"[DEBUG] 从分类 {category} 中删除域名: {domain}")
+                    logger.debug("从分类 %s 中删除域名: %s", category, domain)
                 
                 # 从搜索URL中删除
                 search_urls = config.get("search_urls", {})
@@ -2930,40 +3922,30 @@ class ResourceSearch(BaseSearch):
                     config["domain_status"] = domain_status
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 删除资源网站: {domain} ({site_type})")
+            self._schedule_save()
+            logger.debug("删除资源网站: %s (%s)", domain, site_type)
         except Exception as e:
-            print(f"[DEBUG] 删除资源网站失败: {e}")
+            logger.debug("删除资源网站失败: %s", e)
     
     def add_to_blacklist(self, domain: str) -> None:
         """添加到黑名单"""
         if "blacklist" not in self.config:
             self.config["blacklist"] = {"domains": [], "enabled": True}
         
-        if domain not in self.config["blacklist"]["domains"]:
+        if domain not in self._blacklist_domains:
             self.config["blacklist"]["domains"].append(domain)
             self._save_config()
     
     def remove_from_blacklist(self, domain: str) -> None:
         """从黑名单移除"""
-        if "blacklist" in self.config and domain in self.config["blacklist"]["domains"]:
+        if "blacklist" in self.config and domain in self._blacklist_domains:
             self.config["blacklist"]["domains"].remove(domain)
             self._save_config()
     
-    def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
-        """切换网站启用状态"""
+    def toggle(self, domain: str, enabled: bool) -> None:
+        """切换本类型网站的启用状态（网站类型已由调用方分派）"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新域名状态
             for category, config in sites_config.items():
@@ -2974,25 +3956,15 @@ class ResourceSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 切换资源网站状态: {domain} -> {'启用' if enabled else '禁用'}")
+            self._schedule_save()
+            logger.debug("切换资源网站状态: %s -> %s", domain, '启用' if enabled else '禁用')
         except Exception as e:
-            print(f"[DEBUG] 切换资源网站状态失败: {e}")
+            logger.debug("切换资源网站状态失败: %s", e)
     
-    def get_site_search_urls(self, site_type: str, domain: str) -> list:
-        """获取指定网站的搜索URL"""
+    def get_search_urls(self, domain: str) -> list:
+        """获取本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return []
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 查找指定域名的搜索URL
             for category, config in sites_config.items():
@@ -3003,23 +3975,13 @@ class ResourceSearch(BaseSearch):
             
             return []
         except Exception as e:
-            print(f"[DEBUG] 获取资源搜索URL失败: {e}")
+            logger.debug("获取资源搜索URL失败: %s", e)
             return []
     
-    def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
-        """更新指定网站的搜索URL"""
+    def update_search_urls(self, domain: str, search_urls: list) -> None:
+        """更新本类型指定网站的搜索URL"""
         try:
-            # 根据网站类型获取配置
-            if site_type == 'web':
-                sites_config = self.config.get("web_sites", {})
-            elif site_type == 'images':
-                sites_config = self.config.get("image_sites", {})
-            elif site_type == 'videos':
-                sites_config = self.config.get("video_sites", {})
-            elif site_type in ['files', 'resources']:
-                sites_config = self.config.get("resource_sites", {})
-            else:
-                return
+            sites_config = self.config.get(self.SITE_KEY, {})
             
             # 更新指定域名的搜索URL
             for category, config in sites_config.items():
@@ -3030,10 +3992,10 @@ class ResourceSearch(BaseSearch):
                     break
             
             # 保存配置
-            self._save_config()
-            print(f"[DEBUG] 更新资源网站 {domain} 的搜索URL: {search_urls}")
+            self._schedule_save()
+            logger.debug("更新资源网站 %s 的搜索URL: %s", domain, search_urls)
         except Exception as e:
-            print(f"[DEBUG] 更新资源搜索URL失败: {e}")
+            logger.debug("更新资源搜索URL失败: %s", e)
 
 
 class UnifiedSearch:
@@ -3059,26 +4021,76 @@ class UnifiedSearch:
         self.video_search.config = self.config  # 共享配置
         self.resource_search = ResourceSearch(config_file)
         self.resource_search.config = self.config  # 共享配置
+        
+        # 网站类型 -> 搜索类，按类型分派的管理操作查表，不再逐个比较类型字符串
+        self._all_backends = (self.web_search, self.image_search, self.video_search, self.resource_search)
+        self._dispatch = {
+            'web': self.web_search,
+            'images': self.image_search,
+            'videos': self.video_search,
+            'files': self.resource_search,
+            'resources': self.resource_search,
+        }
+        
+        # 进行中的搜索，相同的并发请求共享同一次搜索结果
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # 批量修改：batch()期间的保存只标记，退出最外层batch时统一写入一次
+        self._batch_lock = threading.Lock()
+        self._batch_depth = 0
+        self._batch_dirty = False
+    
+    @contextmanager
+    def batch(self):
+        """批量修改配置（如新建分类时加入多个网站），期间多次保存合并为退出时的一次写入
+        
+        写入失败时在退出batch时抛出异常
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                dirty = self._batch_depth == 0 and self._batch_dirty
+                if dirty:
+                    self._batch_dirty = False
+            if dirty:
+                self._save_config()
+    
+    def _rebuild_plans(self) -> None:
+        """配置变更后同步共享配置，并重建各搜索类的搜索计划"""
+        for backend in self._all_backends:
+            backend.config = self.config
+            backend._rebuild_plans()
+    
+    def flush_config(self) -> None:
+        """立即写入各搜索类尚未保存的延迟修改"""
+        for backend in self._all_backends:
+            backend.flush_config()
     
     def _load_config(self) -> Dict[str, Any]:
-        """加载配置文件"""
+        """加载配置文件（重新加载前先写入尚未保存的延迟修改，避免修改丢失）"""
+        if hasattr(self, '_all_backends'):
+            self.flush_config()
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    print(f"[DEBUG] 从文件加载配置: {self.config_file}")
-                    return config
+                config = _read_config_file(self.config_file)
+                logger.debug("从文件加载配置: %s", self.config_file)
+                return config
         except Exception as e:
-            print(f"[DEBUG] 加载配置失败: {e}")
+            logger.warning("加载配置失败: %s", e)
         
         # 返回默认配置 - 使用main.py中的DEFAULT_CONFIG
         try:
             from main import DEFAULT_CONFIG
-            print(f"[DEBUG] 使用默认配置")
-            return DEFAULT_CONFIG.copy()
+            logger.debug("使用默认配置")
+            return copy.deepcopy(DEFAULT_CONFIG)
         except ImportError:
             # 如果无法导入，返回最小配置
-            print(f"[DEBUG] 使用最小配置")
+            logger.debug("使用最小配置")
             return {
                 "search_engines": {},
                 "web_sites": {"custom": {"domains": [], "enabled": True, "domain_status": {}, "search_urls": {}}},
@@ -3090,13 +4102,24 @@ class UnifiedSearch:
             }
     
     def _save_config(self) -> None:
-        """保存配置到文件"""
+        """保存配置到文件（batch()期间只同步派生索引，退出batch时再写入）"""
+        with self._batch_lock:
+            if self._batch_depth:
+                self._batch_dirty = True
+                deferred = True
+            else:
+                deferred = False
+        if deferred:
+            self._rebuild_plans()
+            return
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+            _write_config_file(self.config_file, self.config)
         except Exception as e:
-            print(f"[DEBUG] 保存配置失败: {e}")
+            logger.warning("保存配置失败: %s", e)
             raise e  # 重新抛出异常，让调用方知道保存失败
+        finally:
+            # 内存中的配置（如settings）已被修改，同步到各搜索类的派生索引和设置快照
+            self._rebuild_plans()
     
     def search(self, query: str, search_type: str = 'web', page: int = 0, limit: Optional[int] = None, filter_mode: str = 'loose', category: str = '') -> List[Dict[str, Any]]:
         """统一搜索接口
@@ -3113,7 +4136,33 @@ class UnifiedSearch:
             搜索结果列表
         """
         search_type = search_type.lower()
+        key = (query, search_type, page, limit, filter_mode, category)
+        
+        # 相同的搜索正在进行时，等待其结果而不是重复请求上游网站
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
         
+        if not is_owner:
+            logger.debug("合并进行中的相同搜索: %s (%s)", query, search_type)
+            return future.result()
+        
+        try:
+            results = self._do_search(query, search_type, page, limit, filter_mode, category)
+            future.set_result(results)
+            return results
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _do_search(self, query: str, search_type: str, page: int, limit: Optional[int], filter_mode: str, category: str) -> List[Dict[str, Any]]:
+        """按搜索类型执行实际搜索"""
         if search_type == 'web':
             return self.web_search.search(query, page, limit, filter_mode)
         elif search_type == 'images':
@@ -3123,7 +4172,7 @@ class UnifiedSearch:
         elif search_type in ['files', 'resources']:
             return self.resource_search.search(query, page, limit, category)
         else:
-            print(f"[DEBUG] 未知的搜索类型: {search_type}")
+            logger.debug("未知的搜索类型: %s", search_type)
             return []
     
     
@@ -3131,247 +4180,189 @@ class UnifiedSearch:
         """获取所有网站配置"""
         # 确保配置是最新的
         self.config = self._load_config()
+        self._rebuild_plans()
         return self.config
     
     def add_site(self, domain: str, site_type: str, search_urls: Optional[List[str]] = None, category: str = 'custom') -> dict:
         """添加网站"""
-        # 根据网站类型选择对应的搜索类
-        if site_type == 'web':
-            return self.web_search.add_site(domain, site_type, search_urls)
-        elif site_type == 'images':
-            return self.image_search.add_site(domain, site_type, search_urls)
-        elif site_type == 'videos':
-            return self.video_search.add_site(domain, site_type, search_urls)
-        elif site_type in ['files', 'resources']:
-            return self.resource_search.add_site(domain, site_type, search_urls, category)
-        else:
+        # 根据网站类型选择对应的搜索类（只有资源网站支持分类）
+        backend = self._dispatch.get(site_type)
+        if backend is None:
             return {'success': False, 'message': f'未知的网站类型: {site_type}'}
+        if backend is self.resource_search:
+            result = backend.add_site(domain, site_type, search_urls, category)
+        else:
+            result = backend.add_site(domain, site_type, search_urls)
+        self._rebuild_plans()
+        return result
     
     def remove_site(self, domain: str, site_type: str) -> None:
         """删除网站"""
-        if site_type == 'web':
-            self.web_search.remove_site(domain, site_type)
-        elif site_type == 'images':
-            self.image_search.remove_site(domain, site_type)
-        elif site_type == 'videos':
-            self.video_search.remove_site(domain, site_type)
-        elif site_type in ['files', 'resources']:
-            self.resource_search.remove_site(domain, site_type)
+        backend = self._dispatch.get(site_type)
+        if backend is not None:
+            backend.remove_site(domain, site_type)
+        self._rebuild_plans()
     
     def add_to_blacklist(self, domain: str) -> None:
-        """添加到黑名单"""
+        """添加到黑名单（各搜索类共享同一份配置，只需修改一次再同步索引）"""
         self.web_search.add_to_blacklist(domain)
-        self.image_search.add_to_blacklist(domain)
-        self.video_search.add_to_blacklist(domain)
-        self.resource_search.add_to_blacklist(domain)
+        self._rebuild_plans()
     
     def remove_from_blacklist(self, domain: str) -> None:
-        """从黑名单移除"""
+        """从黑名单移除（各搜索类共享同一份配置，只需修改一次再同步索引）"""
         self.web_search.remove_from_blacklist(domain)
-        self.image_search.remove_from_blacklist(domain)
-        self.video_search.remove_from_blacklist(domain)
-        self.resource_search.remove_from_blacklist(domain)
+        self._rebuild_plans()
     
     def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
         """切换网站启用状态"""
-        if site_type == 'web':
-            self.web_search.toggle_site_enabled(domain, site_type, enabled)
-        elif site_type == 'images':
-            self.image_search.toggle_site_enabled(domain, site_type, enabled)
-        elif site_type == 'videos':
-            self.video_search.toggle_site_enabled(domain, site_type, enabled)
-        elif site_type in ['files', 'resources']:
-            self.resource_search.toggle_site_enabled(domain, site_type, enabled)
+        backend = self._dispatch.get(site_type)
+        if backend is not None:
+            backend.toggle(domain, enabled)
+        self._rebuild_plans()
     
     def get_site_search_urls(self, site_type: str, domain: str) -> list:
         """获取指定网站的搜索URL"""
-        if site_type == 'web':
-            return self.web_search.get_site_search_urls(site_type, domain)
-        elif site_type == 'images':
-            return self.image_search.get_site_search_urls(site_type, domain)
-        elif site_type == 'videos':
-            return self.video_search.get_site_search_urls(site_type, domain)
-        elif site_type in ['files', 'resources']:
-            return self.resource_search.get_site_search_urls(site_type, domain)
-        else:
+        backend = self._dispatch.get(site_type)
+        if backend is None:
+            return []
+        return backend.get_search_urls(domain)
+    
+    def get_site_categories(self, site_type: str, domain: str) -> List[str]:
+        """获取指定网站所属的全部分类"""
+        backend = self._dispatch.get(site_type)
+        if backend is None:
             return []
+        return list(backend._site_categories(backend.SITE_TYPE_KEYS[site_type], domain))
     
     def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
         """更新指定网站的搜索URL"""
-        if site_type == 'web':
-            self.web_search.update_site_search_urls(site_type, domain, search_urls)
-        elif site_type == 'images':
-            self.image_search.update_site_search_urls(site_type, domain, search_urls)
-        elif site_type == 'videos':
-            self.video_search.update_site_search_urls(site_type, domain, search_urls)
-        elif site_type in ['files', 'resources']:
-            self.resource_search.update_site_search_urls(site_type, domain, search_urls)
+        backend = self._dispatch.get(site_type)
+        if backend is not None:
+            backend.update_search_urls(domain, search_urls)
+        self._rebuild_plans()
     
     def add_category(self, name: str, description: str = '') -> dict:
         """添加资源分类"""
+        # 获取资源分类配置
+        resource_categories = self.config.get("resource_categories", {})
+        
+        # 检查分类是否已存在
+        if name in resource_categories:
+            return {'success': False, 'message': f'分类 "{name}" 已存在'}
+        
+        # 添加新分类
+        resource_categories[name] = {
+            "description": description,
+            "created_at": time.time()
+        }
+        self.config["resource_categories"] = resource_categories
+        
+        # 只有写文件可能失败，派生索引由_save_config同步
         try:
-            # 获取资源分类配置
-            resource_categories = self.config.get("resource_categories", {})
-            
-            # 检查分类是否已存在
-            if name in resource_categories:
-                return {'success': False, 'message': f'分类 "{name}" 已存在'}
-            
-            # 添加新分类
-            resource_categories[name] = {
-                "description": description,
-                "created_at": time.time()
-            }
-            
-            self.config["resource_categories"] = resource_categories
             self._save_config()
-            
-            return {'success': True, 'message': f'分类 "{name}" 添加成功'}
-            
-        except Exception as e:
-            print(f"[DEBUG] 添加分类失败: {e}")
+        except _CONFIG_SAVE_ERRORS as e:
+            logger.debug("添加分类失败: %s", e)
             return {'success': False, 'message': f'添加失败: {str(e)}'}
+        
+        return {'success': True, 'message': f'分类 "{name}" 添加成功'}
     
     def delete_category(self, name: str) -> dict:
         """删除资源分类"""
+        # 获取资源分类配置
+        resource_categories = self.config.get("resource_categories", {})
+        
+        # 检查分类是否存在
+        if name not in resource_categories:
+            return {'success': False, 'message': f'分类 "{name}" 不存在'}
+        
+        # 检查是否有网站使用此分类（一次 get 代替 in + 下标两次查找）
+        site_config = self.config.get("resource_sites", {}).get(name)
+        if site_config and site_config.get("domains"):
+            return {'success': False, 'message': f'分类 "{name}" 下还有网站，无法删除'}
+        
+        # 删除分类
+        del resource_categories[name]
+        self.config["resource_categories"] = resource_categories
+        
         try:
-            # 获取资源分类配置
-            resource_categories = self.config.get("resource_categories", {})
-            
-            # 检查分类是否存在
-            if name not in resource_categories:
-                return {'success': False, 'message': f'分类 "{name}" 不存在'}
-            
-            # 检查是否有网站使用此分类
-            resource_sites = self.config.get("resource_sites", {})
-            if name in resource_sites and resource_sites[name].get("domains"):
-                return {'success': False, 'message': f'分类 "{name}" 下还有网站，无法删除'}
-            
-            # 删除分类
-            del resource_categories[name]
-            self.config["resource_categories"] = resource_categories
             self._save_config()
-            
-            return {'success': True, 'message': f'分类 "{name}" 删除成功'}
-            
-        except Exception as e:
-            print(f"[DEBUG] 删除分类失败: {e}")
+        except _CONFIG_SAVE_ERRORS as e:
+            logger.debug("删除分类失败: %s", e)
             return {'success': False, 'message': f'删除失败: {str(e)}'}
+        
+        return {'success': True, 'message': f'分类 "{name}" 删除成功'}
     
     def add_site_to_category(self, domain: str, site_type: str, target_category: str) -> dict:
         """将网站添加到指定分类（支持多分类）"""
+        if site_type not in ['files', 'resources']:
+            return {'success': False, 'message': '只有资源网站支持分类'}
+        
+        # 获取资源网站配置
+        resource_sites = self.config.get("resource_sites", {})
+        
+        # 检查网站是否存在于custom分类中（主分类）
+        if not self.resource_search._has_site_domain("resource_sites", "custom", domain):
+            return {'success': False, 'message': f'网站 {domain} 不存在'}
+        
+        # 确保目标分类存在，setdefault 一次查找完成判断和创建
+        target_config = resource_sites.setdefault(target_category, {
+            "domains": [],
+            "enabled": True
+        })
+        
+        # 将网站添加到目标分类（如果尚未存在）
+        if self.resource_search._has_site_domain("resource_sites", target_category, domain):
+            return {'success': True, 'message': f'网站 {domain} 已在分类 {target_category} 中'}
+        
+        # 只添加域名，不复制URL和状态
+        target_config.setdefault("domains", []).append(domain)
+        self.config["resource_sites"] = resource_sites
+        
         try:
-            if site_type not in ['files', 'resources']:
-                return {'success': False, 'message': '只有资源网站支持分类'}
-            
-            # 获取资源网站配置
-            resource_sites = self.config.get("resource_sites", {})
-            
-            # 检查网站是否存在于custom分类中（主分类）
-            custom_sites = resource_sites.get("custom", {})
-            if domain not in custom_sites.get("domains", []):
-                return {'success': False, 'message': f'网站 {domain} 不存在'}
-            
-            # 确保目标分类存在
-            if target_category not in resource_sites:
-                resource_sites[target_category] = {
-                    "domains": [],
-                    "enabled": True
-                }
-            
-            # 将网站添加到目标分类（如果尚未存在）
-            target_config = resource_sites[target_category]
-            domains = target_config.get("domains", [])
-            
-            if domain in domains:
-                return {'success': True, 'message': f'网站 {domain} 已在分类 {target_category} 中'}
-            
-            # 只添加域名，不复制URL和状态
-            domains.append(domain)
-            target_config["domains"] = domains
-            
-            resource_sites[target_category] = target_config
-            self.config["resource_sites"] = resource_sites
             self._save_config()
-            
-            return {'success': True, 'message': f'网站 {domain} 已添加到分类 {target_category}'}
-            
-        except Exception as e:
-            print(f"[DEBUG] 添加网站到分类失败: {e}")
+        except _CONFIG_SAVE_ERRORS as e:
+            logger.debug("添加网站到分类失败: %s", e)
             return {'success': False, 'message': f'添加失败: {str(e)}'}
+        
+        return {'success': True, 'message': f'网站 {domain} 已添加到分类 {target_category}'}
     
     def remove_site_from_category(self, domain: str, site_type: str, category: str) -> dict:
         """从指定分类中移除网站"""
+        if site_type not in ['files', 'resources']:
+            return {'success': False, 'message': '只有资源网站支持分类'}
+        
+        # 获取资源网站配置
+        resource_sites = self.config.get("resource_sites", {})
+        
+        config = resource_sites.get(category)
+        if config is None:
+            return {'success': False, 'message': f'分类 {category} 不存在'}
+        
+        if not self.resource_search._has_site_domain("resource_sites", category, domain):
+            return {'success': False, 'message': f'网站 {domain} 不在分类 {category} 中'}
+        
+        # 从分类中移除网站（只移除域名），成员判断已走集合索引，列表只扫描一次
+        config["domains"].remove(domain)
+        self.config["resource_sites"] = resource_sites
+        
         try:
-            if site_type not in ['files', 'resources']:
-                return {'success': False, 'message': '只有资源网站支持分类'}
-            
-            # 获取资源网站配置
-            resource_sites = self.config.get("resource_sites", {})
-            
-            if category not in resource_sites:
-                return {'success': False, 'message': f'分类 {category} 不存在'}
-            
-            config = resource_sites[category]
-            domains = config.get("domains", [])
-            
-            if domain not in domains:
-                return {'success': False, 'message': f'网站 {domain} 不在分类 {category} 中'}
-            
-            # 从分类中移除网站（只移除域名）
-            domains.remove(domain)
-            config["domains"] = domains
-            
-            resource_sites[category] = config
-            self.config["resource_sites"] = resource_sites
             self._save_config()
-            
-            return {'success': True, 'message': f'网站 {domain} 已从分类 {category} 中移除'}
-            
-        except Exception as e:
-            print(f"[DEBUG] 从分类移除网站失败: {e}")
+        except _CONFIG_SAVE_ERRORS as e:
+            logger.debug("从分类移除网站失败: %s", e)
             return {'success': False, 'message': f'移除失败: {str(e)}'}
+        
+        return {'success': True, 'message': f'网站 {domain} 已从分类 {category} 中移除'}
 
 
 # 为了保持向后兼容性，创建一个新的WebSearch类
-class WebSearchCompat:
-    """向后兼容的WebSearch类，实际使用UnifiedSearch"""
+class WebSearchCompat(UnifiedSearch):
+    """向后兼容的WebSearch类，直接继承UnifiedSearch，管理方法不再逐个转发"""
     
-    def __init__(self, config_file: str = "sites_config.json"):
-        self.unified_search = UnifiedSearch(config_file)
+    @property
+    def unified_search(self) -> 'UnifiedSearch':
+        """旧代码通过 unified_search 访问底层实例，现在就是自身"""
+        return self
     
     def search_web(self, query: str, stype: str = 'web', page: int = 0, limit: Optional[int] = None, filter_mode: str = 'loose') -> List[Dict[str, Any]]:
         """向后兼容的搜索方法"""
-        return self.unified_search.search(query, stype, page, limit, filter_mode)
-    
-    def get_all_sites(self) -> Dict[str, Any]:
-        """获取所有网站配置"""
-        return self.unified_search.get_all_sites()
-    
-    def add_site(self, domain: str, site_type: str, search_urls: Optional[List[str]] = None) -> dict:
-        """添加网站"""
-        return self.unified_search.add_site(domain, site_type, search_urls)
-    
-    def remove_site(self, domain: str, site_type: str) -> None:
-        """删除网站"""
-        self.unified_search.remove_site(domain, site_type)
-    
-    def add_to_blacklist(self, domain: str) -> None:
-        """添加到黑名单"""
-        self.unified_search.add_to_blacklist(domain)
-    
-    def remove_from_blacklist(self, domain: str) -> None:
-        """从黑名单移除"""
-        self.unified_search.remove_from_blacklist(domain)
-    
-    def toggle_site_enabled(self, domain: str, site_type: str, enabled: bool) -> None:
-        """切换网站启用状态"""
-        self.unified_search.toggle_site_enabled(domain, site_type, enabled)
-    
-    def get_site_search_urls(self, site_type: str, domain: str) -> list:
-        """获取指定网站的搜索URL"""
-        return self.unified_search.get_site_search_urls(site_type, domain)
-    
-    def update_site_search_urls(self, site_type: str, domain: str, search_urls: list) -> None:
-        """更新指定网站的搜索URL"""
-        self.unified_search.update_site_search_urls(site_type, domain, search_urls)
\ No newline at end of file
+        return self.search(query, stype, page, limit, filter_mode)